@@ -0,0 +1,270 @@
+"""
+This module computes shortest paths from many sources at once, running the
+Dijkstra engine over a pool of processes.
+
+The compact adjacency is copied once into shared memory, which every worker
+maps when starting, and workers write each source row straight into the
+output file. Layout of the output file, every section aligned to 8 bytes:
+    - Header: magic, version, flags, vertices and sources counts
+    - Sources: int64 vertice indexes, one per row
+    - Distances: float64 rows of one metric per vertice, inf when unreached
+    - Predecessors: int64 rows of one parent index per vertice, -1 for the
+      source and unreached vertices
+"""
+
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import mmap
+import os
+import struct
+import sys
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:     # python 3.7, the adjacency is pickled once per worker
+    shared_memory = None
+
+import logger
+import modeler
+import profiler
+from data_structures import CompactAdjacency
+from dijkstra import shortest_paths
+from repr_types import compact_adjacent_list
+
+
+_logger = logger.get_logger('all_pairs')
+
+MAGIC = b'APSP'
+VERSION = 1
+EXTENSION = '.paths'
+
+# magic, version, flags, vertices, sources
+HEADER = struct.Struct('<4sHHQQ')
+
+BIG_ENDIAN = 1
+
+
+def main():
+    parser = modeler.argument_parser(description='''Shortest paths from many
+                                     sources, written as a distance and
+                                     predecessor matrix.''')
+
+    parser.add_argument('-s', '--sources', help='''Source vertices (default:
+                        every vertice)''', nargs='+')
+
+    parser.add_argument('-w', '--workers', help='''Worker processes (default:
+                        cores count)''', type=int)
+
+    parser.add_argument('-o', '--output', help=f'''Matrix file (default: graph
+                        name with {EXTENSION} extension)''')
+
+    args = parser.parse_args()
+    graph = modeler.graph_from_arguments(args)
+
+    output = args.output or f'{graph.name}{EXTENSION}'
+    with profiler.phase('representation'):
+        adjacency = compact_adjacent_list(graph)
+    with profiler.phase('algorithm'):
+        all_pairs(graph, output, sources=args.sources, workers=args.workers,
+                  adjacency=adjacency)
+    _logger.info('matrix was written to: %s', output)
+
+
+def all_pairs(graph, filename, sources=None, workers=None, adjacency=None):
+    """
+    Writes the shortest paths from each source, every vertice by default,
+    into the matrix file. Rows follow the sources order.
+    """
+    if adjacency is None:
+        adjacency = compact_adjacent_list(graph)
+    if sources is None:
+        source_indexes = array('q', range(len(graph.vertices)))
+    else:
+        source_indexes = array('q', map(graph.index_of, sources))
+    workers = workers or os.cpu_count() or 1
+
+    create_matrix(filename, len(adjacency), source_indexes)
+    rows = list(enumerate(source_indexes))
+    # a few chunks per worker, so slower rows are balanced between workers
+    chunk_size = max(1, len(rows) // (4 * workers))
+
+    with _share_adjacency(adjacency) as shared:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_start_worker,
+                                 initargs=(shared, filename)) as executor:
+            done = 0
+            for row in executor.map(_write_row, rows, chunksize=chunk_size):
+                done += 1
+                _logger.debug('row %d of %d written', done, len(rows))
+
+    profiler.count('sources', len(rows))
+    profiler.count('workers', workers)
+    return filename
+
+
+def create_matrix(filename, vertices_size, source_indexes):
+    flags = BIG_ENDIAN if sys.byteorder == 'big' else 0
+    matrix_size = 8 * vertices_size * len(source_indexes)
+    with open(filename, 'wb') as writer:
+        writer.write(HEADER.pack(MAGIC, VERSION, flags, vertices_size,
+                                 len(source_indexes)))
+        writer.write(bytes(_padding(HEADER.size)))
+        writer.write(source_indexes.tobytes())
+        # rows are filled by the workers, sparse files when supported
+        writer.truncate(writer.tell() + 2 * matrix_size)
+
+
+@dataclass
+class PathMatrix:
+    vertices_size: int
+    sources: memoryview
+    distances: memoryview
+    predecessors: memoryview
+
+    def row(self, row):
+        """Copies of the row distances and predecessors."""
+        start = row * self.vertices_size
+        end = start + self.vertices_size
+        return (array('d', self.distances[start:end]),
+                array('q', self.predecessors[start:end]))
+
+    def path(self, row, target_index):
+        """Vertice indexes from the row source to the target, empty when unreached."""
+        distances, predecessors = self.row(row)
+        if distances[target_index] == float('inf'):
+            return []
+        path = [target_index]
+        while predecessors[path[-1]] != -1:
+            path.append(predecessors[path[-1]])
+        return path[::-1]
+
+
+class open_matrix:
+    """
+    Maps a matrix file and exposes it as a PathMatrix of memoryviews, which
+    are released when leaving the context.
+    """
+
+    def __init__(self, filename, writable=False):
+        self.filename = filename
+        self.writable = writable
+        self.views = []
+
+    def __enter__(self):
+        mode, access = 'rb', mmap.ACCESS_READ
+        if self.writable:
+            mode, access = 'r+b', mmap.ACCESS_WRITE
+        with open(self.filename, mode) as reader:
+            self.buffer = mmap.mmap(reader.fileno(), 0, access=access)
+
+        magic, version, flags, vertices_size, sources_size = \
+            HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError('Not a shortest paths matrix file.')
+        if version != VERSION:
+            raise ValueError(f'Unsupported matrix version [{version}].')
+        if bool(flags & BIG_ENDIAN) != (sys.byteorder == 'big'):
+            raise ValueError('Matrix file was written with another byte order.')
+
+        self.position = HEADER.size + _padding(HEADER.size)
+        matrix_size = vertices_size * sources_size
+        return PathMatrix(vertices_size=vertices_size,
+                          sources=self._column('q', sources_size),
+                          distances=self._column('d', matrix_size),
+                          predecessors=self._column('q', matrix_size))
+
+    def __exit__(self, *args):
+        for view in reversed(self.views):
+            view.release()
+        self.buffer.close()
+
+    def _column(self, typecode, length):
+        view = memoryview(self.buffer)[self.position:self.position + 8 * length]
+        self.views.append(view)
+        self.position += 8 * length
+        column = view.cast(typecode)
+        self.views.append(column)
+        return column
+
+
+# state of each worker process, set once by _start_worker
+_worker = None
+
+
+class _share_adjacency:
+    """
+    Copies the adjacency columns into one shared memory block, giving the
+    arguments workers needs to map it. The block is freed when leaving.
+    """
+
+    def __init__(self, adjacency):
+        self.adjacency = adjacency
+        self.memory = None
+
+    def __enter__(self):
+        adjacency = self.adjacency
+        if shared_memory is None:
+            return adjacency
+
+        weights = adjacency.weights
+        if isinstance(weights, list):   # distances are floats anyway
+            weights = array('d', weights)
+        columns = (adjacency.offsets, adjacency.targets, weights)
+        size = sum(8 * len(column) for column in columns)
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+        position = 0
+        for column in columns:
+            data = memoryview(column).cast('B')
+            self.memory.buf[position:position + len(data)] = data
+            position += len(data)
+            data.release()
+        return (self.memory.name, len(adjacency), len(adjacency.targets),
+                weights.typecode)
+
+    def __exit__(self, *args):
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+
+
+def _start_worker(shared, filename):
+    global _worker
+    if isinstance(shared, CompactAdjacency):
+        adjacency, memory = shared, None
+    else:
+        name, vertices_size, edges_size, weights_typecode = shared
+        memory = shared_memory.SharedMemory(name=name)
+        offsets_end = 8 * (vertices_size + 1)
+        targets_end = offsets_end + 8 * edges_size
+        buffer = memory.buf
+        adjacency = CompactAdjacency(
+            offsets=buffer[:offsets_end].cast('q'),
+            targets=buffer[offsets_end:targets_end].cast('q'),
+            weights=buffer[targets_end:targets_end + 8 * edges_size]
+                .cast(weights_typecode))
+
+    matrix = open_matrix(filename, writable=True)
+    # memory and matrix are kept referenced for the worker whole life
+    _worker = (adjacency, memory, matrix, matrix.__enter__())
+
+
+def _write_row(row_source):
+    row, source_index = row_source
+    adjacency, _, _, matrix = _worker
+    metrics, parents = shortest_paths(adjacency, source_index)
+
+    start = row * matrix.vertices_size
+    end = start + matrix.vertices_size
+    matrix.distances[start:end] = array('d', metrics)
+    matrix.predecessors[start:end] = array('q', parents)
+    return row
+
+
+def _padding(size):
+    return -size % 8
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""
+This module runs one algorithm over every graph file found in directories,
+loading and solving the graphs over a pool of processes.
+
+Each graph gets its results written to a JSON file, mirroring its path under
+the output directory, and a summary of every run is written next to them.
+A failing graph is recorded in the summary without stopping the batch.
+"""
+
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import asdict
+import json
+import os
+import time
+
+import binary_graph
+import dfs
+import dijkstra
+import kruskal
+import logger
+import modeler
+import prim_jarnik
+from util import display_table
+
+
+_logger = logger.get_logger('batch')
+
+ALGORITHMS = ('dfs', 'dijkstra', 'kruskal', 'prim')
+
+GRAPH_EXTENSIONS = ('.json', binary_graph.EXTENSION)
+
+SUMMARY = 'summary.json'
+
+RESULT_SUFFIXES = tuple(f'.{algorithm}.json' for algorithm in ALGORITHMS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='''Run an algorithm over
+                                     every graph file of directories.''')
+
+    parser.add_argument('-v', '--verbose', help='Be moderatly verbose.',
+                        default=False, action='store_true')
+
+    parser.add_argument('-a', '--algorithm', help='Algorithm to run.',
+                        choices=ALGORITHMS, required=True)
+
+    parser.add_argument('-s', '--source', help='''Dijkstra source vertice
+                        (default: first vertice of each graph)''')
+
+    parser.add_argument('-w', '--workers', help='''Worker processes (default:
+                        cores count)''', type=int)
+
+    parser.add_argument('--max-pending', help='''Graphs submitted to the
+                        workers at once (default: twice the workers)''',
+                        type=int)
+
+    parser.add_argument('-r', '--recursive', help='Look into subdirectories.',
+                        default=False, action='store_true')
+
+    parser.add_argument('-o', '--output', help='''Results directory (default:
+                        results/)''', default='results/')
+
+    parser.add_argument('directories', nargs='*', default=['dataset/'],
+                        help='Graph directories (default: dataset/)')
+
+    args = parser.parse_args()
+
+    logger.setup(args.verbose)
+
+    summary = run_batch(args.directories, args.algorithm, args.output,
+                        source=args.source, workers=args.workers,
+                        max_pending=args.max_pending, recursive=args.recursive)
+    display_summary(summary)
+
+
+def discover_graphs(directories, recursive=False, exclude=()):
+    """
+    Yields (directory, filename) pairs of the graph files found, leaving
+    out batch results and the subdirectories in `exclude`.
+    """
+    excluded = {os.path.realpath(path) for path in exclude}
+    for directory in directories:
+        for root, subdirectories, filenames in os.walk(directory):
+            if not recursive:
+                subdirectories.clear()
+            subdirectories[:] = sorted(
+                name for name in subdirectories
+                if os.path.realpath(os.path.join(root, name)) not in excluded)
+            for filename in sorted(filenames):
+                if filename.endswith(GRAPH_EXTENSIONS) and \
+                        not is_result(filename):
+                    yield directory, os.path.join(root, filename)
+
+
+def is_result(filename):
+    """Tells whether the file is a batch summary or algorithm result."""
+    name = os.path.basename(filename)
+    return name == SUMMARY or name.endswith(RESULT_SUFFIXES)
+
+
+def run_batch(directories, algorithm, output, source=None, workers=None,
+              max_pending=None, recursive=False):
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    # results written under a graph directory are not graphs to run over
+    graphs = discover_graphs(directories, recursive=recursive,
+                             exclude=[output])
+    runs = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for directory, filename in graphs:
+            # bounds the queued graphs, discovery goes on as runs finish
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                runs.extend(_collect(done))
+
+            # keeps the graph extension, so x.json and x.graph do not collide
+            results = os.path.join(output, os.path.relpath(filename, directory))
+            results = f'{results}.{algorithm}.json'
+            pending.add(executor.submit(run_graph, filename, algorithm,
+                                        results, source))
+        runs.extend(_collect(wait(pending).done))
+
+    runs.sort(key=lambda run: run['file'])
+    summary = {
+        'algorithm': algorithm,
+        'graphs': len(runs),
+        'failed': sum(run['status'] == 'error' for run in runs),
+        'seconds': sum(run['seconds'] for run in runs),
+        'runs': runs,
+    }
+
+    os.makedirs(output, exist_ok=True)
+    filename = os.path.join(output, SUMMARY)
+    with open(filename, 'w') as writer:
+        writer.write(json.dumps(summary, indent=4))
+    _logger.info('summary was written to: %s', filename)
+    return summary
+
+
+def run_graph(filename, algorithm, results, source=None):
+    """Loads and solves one graph file, returning its summary entry."""
+    run = {
+        'file': filename,
+        'results': None,
+        'status': 'ok',
+        'error': None,
+        'vertices': 0,
+        'edges': 0,
+        'seconds': 0.0,
+    }
+    start = time.perf_counter()
+    try:
+        with open(filename, 'rb') as reader:
+            graph = modeler.read_graph(reader)
+        run['vertices'] = len(graph.vertices)
+        run['edges'] = len(graph.edges)
+
+        data = solve(graph, algorithm, source=source)
+        os.makedirs(os.path.dirname(results) or '.', exist_ok=True)
+        with open(results, 'w') as writer:
+            writer.write(json.dumps(data, indent=4))
+        run['results'] = results
+    except Exception as error:
+        run['status'] = 'error'
+        run['error'] = f'{type(error).__name__}: {error}'
+    run['seconds'] = time.perf_counter() - start
+    return run
+
+
+def solve(graph, algorithm, source=None):
+    if algorithm == 'dfs':
+        table, timestamp = dfs.dfs_search(graph)
+        return {
+            'timestamp': timestamp,
+            'vertices': {vertice: asdict(board)
+                         for vertice, board in zip(graph.vertices, table)},
+        }
+
+    if algorithm == 'dijkstra':
+        if source is None:
+            source = graph.vertices[0]
+        elif not graph.has_vertice(source):
+            raise ValueError(f'Source vertice [{source}] is not in the graph.')
+        return {
+            'source': source,
+            'items': [asdict(item) for item in dijkstra.search(graph, source)],
+        }
+
+    if algorithm in ('kruskal', 'prim'):
+        if not graph.is_weighted:
+            raise ValueError('Minimum spanning trees requires weighted graphs.')
+        if algorithm == 'kruskal':
+            edges = list(kruskal.min_spanning_tree(graph))
+        else:
+            if graph.is_oriented:
+                raise ValueError('Minimum spanning trees requires '
+                                 'non-oriented graphs.')
+            edges = list(prim_jarnik.min_spanning_tree(graph))
+        return {
+            'weight': sum(edge.value for edge in edges),
+            'edges': [{'pair': list(edge.pair), 'value': edge.value}
+                      for edge in edges],
+        }
+
+    raise ValueError(f'Unknown algorithm [{algorithm}].')
+
+
+def _collect(futures):
+    for future in futures:
+        run = future.result()
+        if run['status'] == 'ok':
+            _logger.info('solved %s in %.3fs', run['file'], run['seconds'])
+        else:
+            _logger.info('failed %s: %s', run['file'], run['error'])
+        yield run
+
+
+def display_summary(summary):
+    if not summary['runs']:
+        _logger.info('no graph files were found')
+        return
+    headers = ['STATUS', 'VERTICES', 'EDGES', 'SECONDS']
+    table = []
+    for run in summary['runs']:
+        table.append([run['status'], str(run['vertices']), str(run['edges']),
+                      f"{run['seconds']:.3f}"])
+    display_table(f"Batch {summary['algorithm']} over {summary['graphs']} "
+                  f"graphs, {summary['failed']} failed", headers, table,
+                  lines=[run['file'] for run in summary['runs']])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+This module times the graph algorithms, readers and representations over
+synthetic graphs of growing sizes, then writes the timings and the estimated
+scaling exponent of each operation to a JSON file.
+"""
+
+
+import argparse
+import json
+import math
+import os
+import tempfile
+import time
+
+import dense
+import dfs
+import dijkstra
+import generators
+import kruskal
+import logger
+import modeler
+import prim_jarnik
+import repr_types
+from util import display_table
+
+
+_logger = logger.get_logger('benchmark')
+
+KINDS = ('random', 'grid', 'scale-free', 'complete')
+
+# cells of the representations laid out as dense matrices
+DENSE_CELLS = {
+    'adjacent_matrix': lambda graph: len(graph.vertices) ** 2,
+    'incidence_matrix': lambda graph: len(graph.vertices) * len(graph.edges),
+    'floyd_warshall': lambda graph: len(graph.vertices) ** 2,
+    'transitive_closure': lambda graph: len(graph.vertices) ** 2,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='''Benchmark the graph
+                                     algorithms over synthetic graphs.''')
+
+    parser.add_argument('-v', '--verbose', help='Be moderatly verbose.',
+                        default=False, action='store_true')
+
+    parser.add_argument('-s', '--sizes', help='''Vertices count of each graph
+                        (default: 100 1000 10000)''', type=int, nargs='+',
+                        default=[100, 1000, 10000])
+
+    parser.add_argument('-k', '--kinds', help='Graph kinds (default: all)',
+                        nargs='+', choices=KINDS, default=list(KINDS))
+
+    parser.add_argument('-r', '--repeat', help='''Runs of each operation, the
+                        best one is kept (default: 3)''', type=int, default=3)
+
+    parser.add_argument('--seed', help='Generators seed (default: 0)',
+                        type=int, default=0)
+
+    parser.add_argument('--max-edges', help='''Skip graphs with more edges
+                        (default: 2000000)''', type=int, default=2000000)
+
+    parser.add_argument('--max-cells', help='''Skip dense matrices with more
+                        cells (default: 10000000)''', type=int,
+                        default=10000000)
+
+    parser.add_argument('-o', '--output', help='''Results file (default:
+                        benchmark.json)''', default='benchmark.json')
+
+    args = parser.parse_args()
+
+    logger.setup(args.verbose)
+
+    results = run_benchmark(args.sizes, kinds=args.kinds, repeat=args.repeat,
+                            seed=args.seed, max_edges=args.max_edges,
+                            max_cells=args.max_cells)
+
+    with open(args.output, 'w') as writer:
+        writer.write(json.dumps(results, indent=4))
+    _logger.info('results were written to: %s', args.output)
+
+    display_results(results)
+
+
+def generate_graph(kind, size, seed=0):
+    if kind == 'random':
+        return generators.random_graph(size, 4 * size, seed=seed)
+    if kind == 'grid':
+        side = max(1, round(math.sqrt(size)))
+        return generators.grid_graph(side, side, seed=seed)
+    if kind == 'scale-free':
+        return generators.scale_free_graph(size, seed=seed)
+    if kind == 'complete':
+        return generators.complete_graph(size, seed=seed)
+    raise ValueError(f'Unknown graph kind [{kind}].')
+
+
+def expected_edges(kind, size):
+    if kind == 'complete':
+        return size * (size - 1) // 2
+    return 4 * size
+
+
+def operations(graph, directory):
+    # (name, function) pairs, every function runs over a fresh graph clone
+    # so memoized representations are built again on each run
+    filename = os.path.join(directory, f'{graph.name}.json')
+    source = graph.vertices[0]
+
+    def read_graph(_):
+        with open(filename, 'rb') as reader:
+            return modeler.read_graph(reader)
+
+    yield 'read_graph', read_graph
+    yield 'dfs_search', lambda g: list(dfs.dfs_search(g)[0])
+    yield 'dijkstra', lambda g: list(dijkstra.search(g, source))
+    yield 'kruskal', lambda g: list(kruskal.min_spanning_tree(g))
+    if not graph.is_oriented:
+        yield 'prim_jarnik', lambda g: list(prim_jarnik.min_spanning_tree(g))
+    if dense.numpy is not None:
+        yield 'floyd_warshall', dense.all_pairs_distances
+        yield 'transitive_closure', dense.transitive_closure
+
+    for name in ('edge_list', 'adjacent_matrix', 'sparse_adjacent_matrix',
+                 'adjacent_list', 'compact_adjacent_list', 'incidence_matrix',
+                 'degree_vector', 'is_graph', 'maybe_remove_duplicate_edges'):
+        yield name, getattr(repr_types, name)
+
+
+def time_operation(function, graph, repeat):
+    timings = []
+    for _ in range(repeat):
+        fresh_graph = graph.clone()
+        start = time.perf_counter()
+        function(fresh_graph)
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+def run_benchmark(sizes, kinds=KINDS, repeat=3, seed=0, max_edges=2000000,
+                  max_cells=10000000):
+    points = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in kinds:
+            for size in sizes:
+                if expected_edges(kind, size) > max_edges:
+                    _logger.info('skipping %s graph of size %d: too many edges',
+                                 kind, size)
+                    continue
+
+                start = time.perf_counter()
+                graph = generate_graph(kind, size, seed=seed)
+                generation = time.perf_counter() - start
+                modeler.dumps(graph, directory=directory)
+                _logger.info('generated %s graph: %d vertices, %d edges',
+                             kind, len(graph.vertices), len(graph.edges))
+
+                for name, function in operations(graph, directory):
+                    cells = DENSE_CELLS.get(name)
+                    if cells is not None and cells(graph) > max_cells:
+                        continue
+                    best, mean = time_operation(function, graph, repeat)
+                    _logger.debug('%s %s: %.6fs', kind, name, best)
+                    points.append({
+                        'kind': kind,
+                        'size': size,
+                        'vertices': len(graph.vertices),
+                        'edges': len(graph.edges),
+                        'operation': name,
+                        'best': best,
+                        'mean': mean,
+                    })
+                points.append({
+                    'kind': kind,
+                    'size': size,
+                    'vertices': len(graph.vertices),
+                    'edges': len(graph.edges),
+                    'operation': 'generate',
+                    'best': generation,
+                    'mean': generation,
+                })
+
+    return {
+        'seed': seed,
+        'repeat': repeat,
+        'points': points,
+        'scaling': scaling_exponents(points),
+    }
+
+
+def scaling_exponents(points):
+    """
+    Least squares slope of log(time) over log(vertices + edges), for each
+    kind and operation. A linear operation scores about 1, a quadratic one
+    about 2.
+    """
+    curves = {}
+    for point in points:
+        key = (point['kind'], point['operation'])
+        curves.setdefault(key, []).append(point)
+
+    exponents = {}
+    for (kind, operation), curve in curves.items():
+        samples = [(math.log(p['vertices'] + p['edges']), math.log(p['best']))
+                   for p in curve if p['best'] > 0 and p['vertices'] + p['edges'] > 1]
+        if len(samples) < 2:
+            continue
+
+        mean_x = sum(x for x, _ in samples) / len(samples)
+        mean_y = sum(y for _, y in samples) / len(samples)
+        variance = sum((x - mean_x) ** 2 for x, _ in samples)
+        if not variance:
+            continue
+        covariance = sum((x - mean_x) * (y - mean_y) for x, y in samples)
+        exponents.setdefault(kind, {})[operation] = covariance / variance
+    return exponents
+
+
+def display_results(results):
+    points = results['points']
+    for kind in dict.fromkeys(p['kind'] for p in points):
+        kind_points = [p for p in points if p['kind'] == kind]
+        sizes = list(dict.fromkeys(p['size'] for p in kind_points))
+        names = list(dict.fromkeys(p['operation'] for p in kind_points))
+
+        timings = {(p['operation'], p['size']): p['best'] for p in kind_points}
+        exponents = results['scaling'].get(kind, {})
+
+        headers = [f'{size:>10}' for size in sizes] + ['  EXPONENT']
+        table = []
+        for name in names:
+            line = [_format_seconds(timings.get((name, size)))
+                    for size in sizes]
+            exponent = exponents.get(name)
+            line.append('-' if exponent is None else f'{exponent:.2f}')
+            table.append(line)
+
+        display_table(f'Benchmark of {kind} graphs (seconds)', headers, table,
+                      lines=names)
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return '-'
+    return f'{seconds:.6f}'
+
+
+if __name__ == '__main__':
+    main()
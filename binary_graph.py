@@ -0,0 +1,196 @@
+"""
+This module provides a versioned binary graph format, loaded through mmap.
+
+Layout, every section starts aligned to 8 bytes:
+    - Header: magic, version, flags and the sections sizes
+    - Graph name, utf-8 encoded
+    - Label table: int64 offsets (vertices + 1) and the utf-8 labels blob
+    - Edges: int64 source indexes, int64 target indexes, the int64 or
+      float64 weights and the one byte row flags of EdgeTable.valued, one
+      entry per edge. Version 1 files have no row flags.
+"""
+
+
+from array import array
+import mmap
+import os
+import struct
+import sys
+
+import logger
+from data_structures import Graph, EdgeTable, weight_column
+from repr_types import CompactAdjacencyBuilder
+
+
+_logger = logger.get_logger(__name__)
+
+MAGIC = b'GRPH'
+VERSION = 2
+EXTENSION = '.graph'
+
+# magic, version, flags, vertices, edges, name size, labels size
+HEADER = struct.Struct('<4sHHQQQQ')
+
+ORIENTED = 1
+WEIGHTED = 2
+FLOAT_WEIGHTS = 4
+BIG_ENDIAN = 8
+
+
+def dumps(graph: Graph, directory=''):
+    filename = f'{graph.name}{EXTENSION}'
+
+    # handle a target directory
+    if directory:
+        if not os.path.isdir(directory):
+            os.mkdir(directory)
+        filename = os.path.join(directory, filename)
+
+    with open(filename, 'wb') as writer:
+        write(graph, writer)
+    _logger.debug(f'graph was written to: {filename}')
+    return filename
+
+
+def write(graph: Graph, writer):
+    labels = [_encode_label(vertice) for vertice in graph.vertices]
+    label_offsets = array('q', [0])
+    for label in labels:
+        label_offsets.append(label_offsets[-1] + len(label))
+
+    sources, targets = graph.edges.index_columns(graph.vertices.ids)
+    weights = graph.edges.weights
+    valued = graph.edges.valued
+
+    flags = 0
+    if graph.is_oriented:
+        flags |= ORIENTED
+    if graph.is_weighted:
+        flags |= WEIGHTED
+    if weights.typecode == 'd':
+        flags |= FLOAT_WEIGHTS
+    if sys.byteorder == 'big':
+        flags |= BIG_ENDIAN
+
+    name = graph.name.encode('utf-8')
+    labels_blob = b''.join(labels)
+    writer.write(HEADER.pack(MAGIC, VERSION, flags, len(labels),
+                             len(sources), len(name), len(labels_blob)))
+    for section in (name, label_offsets.tobytes(), labels_blob,
+                    sources.tobytes(), targets.tobytes(), weights.tobytes(),
+                    bytes(valued)):
+        writer.write(section)
+        writer.write(bytes(_padding(len(section))))
+
+
+def is_binary(io_wrapper):
+    if hasattr(io_wrapper, 'peek'):
+        return io_wrapper.peek(len(MAGIC))[:len(MAGIC)] == MAGIC
+    head = io_wrapper.read(len(MAGIC))
+    io_wrapper.seek(0)
+    return head == MAGIC
+
+
+def read_graph(io_wrapper):
+    with _open_columns(io_wrapper) as columns:
+        graph = columns.graph()
+        graph.edges = EdgeTable.from_columns(graph.vertices, columns.sources,
+                                             columns.targets, columns.weights,
+                                             columns.valued)
+    return graph
+
+
+def read_compact_graph(io_wrapper):
+    with _open_columns(io_wrapper) as columns:
+        graph = columns.graph()
+        weights = weight_column(columns.weights, columns.valued)
+        if not graph.is_weighted:   # non-weighted graphs costs one per edge
+            weights = array('q', [1]) * len(columns.sources)
+        builder = CompactAdjacencyBuilder.from_columns(columns.sources,
+                                                       columns.targets, weights)
+    return graph, builder.build(len(graph.vertices), graph.is_oriented)
+
+
+class _open_columns:
+    """
+    Maps a binary graph file and exposes its sections as memoryviews,
+    which are released when leaving the context.
+    """
+
+    def __init__(self, io_wrapper):
+        self.io_wrapper = io_wrapper
+        self.views = []
+
+    def __enter__(self):
+        try:
+            self.buffer = mmap.mmap(self.io_wrapper.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            # in memory streams has no file descriptor
+            self.buffer = self.io_wrapper.read()
+
+        magic, version, self.flags, vertices_size, edges_size, \
+            name_size, labels_size = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError('Not a binary graph file.')
+        if version not in (1, VERSION):
+            raise ValueError(f'Unsupported binary graph version [{version}].')
+        swapped = bool(self.flags & BIG_ENDIAN) != (sys.byteorder == 'big')
+
+        self.position = HEADER.size
+        self.name = bytes(self._section(name_size)).decode('utf-8')
+        label_offsets = self._column('q', vertices_size + 1, swapped)
+        labels_blob = bytes(self._section(labels_size))
+        self.vertices = []
+        for index in range(vertices_size):
+            label = labels_blob[label_offsets[index]:label_offsets[index + 1]]
+            self.vertices.append(label.decode('utf-8'))
+
+        self.weights_typecode = 'd' if self.flags & FLOAT_WEIGHTS else 'q'
+        self.sources = self._column('q', edges_size, swapped)
+        self.targets = self._column('q', edges_size, swapped)
+        self.weights = self._column(self.weights_typecode, edges_size, swapped)
+        if version == 1:
+            # edge rows are only valued on weighted graphs
+            self.valued = bytes([bool(self.flags & WEIGHTED)]) * edges_size
+        else:
+            self.valued = bytes(self._section(edges_size))
+        return self
+
+    def __exit__(self, *args):
+        for view in reversed(self.views):
+            view.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.io_wrapper.close()
+
+    def graph(self):
+        return Graph(name=self.name,
+                     is_oriented=bool(self.flags & ORIENTED),
+                     is_weighted=bool(self.flags & WEIGHTED),
+                     vertices=self.vertices)
+
+    def _section(self, size):
+        view = memoryview(self.buffer)[self.position:self.position + size]
+        self.views.append(view)
+        self.position += size + _padding(size)
+        return view
+
+    def _column(self, typecode, length, swapped):
+        view = self._section(8 * length).cast(typecode)
+        self.views.append(view)
+        if not swapped:
+            return view
+        column = array(typecode, view)
+        column.byteswap()
+        return column
+
+
+def _encode_label(vertice):
+    if not isinstance(vertice, str):
+        raise ValueError(f'Binary graphs requires text labels, found [{vertice!r}].')
+    return vertice.encode('utf-8')
+
+
+def _padding(size):
+    return -size % 8
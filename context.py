@@ -6,22 +6,22 @@ _logger = logger.get_logger(__name__)
 
 def save_point(old_context, running_context):
     _logger.debug('transaction status: commit')
-    new_context = running_context.clone()
-    new_context.previous_context = old_context.clone()
+    # changes are already applied, just remember where this commit starts
+    new_context = running_context.branch()
+    new_context.previous_context = old_context
     return new_context
 
 
 def roll_last_context(running_context):
     _logger.debug('transaction status: rolling back')
-    old_context = running_context.previous_context.clone()
-    return old_context
+    return running_context.previous_context.rollback()
 
 
 def run_interactive_context(running_context, predicate, callback,
                  one_transaction=True):
     try:
         while True:
-            flash_context = running_context.clone()
+            flash_context = running_context.branch()
             flash_context.previous_context = running_context
 
             _logger.debug('start-context: %s', flash_context)
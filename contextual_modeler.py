@@ -13,7 +13,7 @@ _logger = logger.get_logger(__name__)
 def with_vertice(message, throlling_message=None, one_transaction=True):
     def wrapper_fn(fn):
         def store_vertice_interceptor(context, vertice):
-            context.graph = upsert_vertice(context.graph, vertice)
+            upsert_vertice(context, vertice)
             return fn(context, vertice)
 
         def runner(**kwargs):
@@ -58,7 +58,7 @@ def edge_builder(edge_context, pair):
 
     edge = Edge((vertice, pair), value=weight)
     _logger.info(f'Creating edge {edge}...')
-    edge_context.graph.edges.append(edge)
+    edge_context.add_edge(edge)
     return edge_context
 
 
@@ -75,16 +75,17 @@ def model_graph_vertices(context, vertice):
 
     next_context = edge_builder(graph=context.graph,
                         meta=context.meta,
-                        previous_context=context.previous_context)
+                        previous_context=context.previous_context,
+                        journal=context.journal)
 
     _logger.info('running-graph %s', context.graph)
     return next_context
 
 
-def upsert_vertice(graph, vertice):
-    if graph.has_vertice(vertice):
+def upsert_vertice(context, vertice):
+    if context.graph.has_vertice(vertice):
         _logger.info('Vertice %s already exists.', vertice)
     else:
         _logger.info('Creating vertice %s...', vertice)
-        graph.vertices.append(vertice)
-    return graph
+        context.add_vertice(vertice)
+    return context
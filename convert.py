@@ -0,0 +1,43 @@
+import argparse
+import os
+
+import binary_graph
+import logger
+import modeler
+
+
+_logger = logger.get_logger('convert')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='''Convert JSON graph files
+                                     into the binary graph format.''')
+
+    parser.add_argument('-v', '--verbose', help='Be moderatly verbose.',
+                        default=False, action='store_true')
+
+    parser.add_argument('-d', '--graph-directory', help='''Directory for saving
+                        binary graphs (default: next to each file)''')
+
+    parser.add_argument('files', nargs='+', help='JSON graph files.')
+
+    args = parser.parse_args()
+
+    logger.setup(args.verbose)
+
+    for filename in args.files:
+        directory = args.graph_directory
+        if directory is None:
+            directory = os.path.dirname(filename)
+        output = convert_graph(filename, directory=directory)
+        _logger.info('converted %s to: %s', filename, output)
+
+
+def convert_graph(filename, directory=''):
+    with open(filename, 'rb') as reader:
+        graph = modeler.read_graph(reader)
+    return binary_graph.dumps(graph, directory=directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,24 +3,403 @@ This module provides the main structures implementation
 """
 
 
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass, field, asdict, make_dataclass
-from typing import List, Any
+import functools
+from typing import Any
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
-@dataclass
 class Edge:
-    pair: List[int]
-    value: int = None
+    __slots__ = ('pair', 'value')
+
+    def __init__(self, pair, value=None):
+        pair_size = len(pair)
+        assert pair_size == 2, f'Wrong edge pair size [{pair_size}], expecting 2.'
+        self.pair = pair
+        self.value = value
 
     def clone(self):
         return Edge(pair=self.pair[:], value=self.value)
 
-    def __post_init__(self):
-        pair_size = len(self.pair)
-        assert pair_size == 2, f'Wrong edge pair size [{pair_size}], expecting 2.'
+    def __eq__(self, other):
+        if not isinstance(other, Edge):
+            return NotImplemented
+        return tuple(self.pair) == tuple(other.pair) and self.value == other.value
+
+    __hash__ = None
 
     def __repr__(self):
-        return f'EdgePair(pair=[{self.pair[0]}->{self.pair[1]}], value={self.value})'
+        pair = self.pair
+        return f'EdgePair(pair=[{pair[0]}->{pair[1]}], value={self.value})'
+
+
+class EdgeView(Edge):
+    """
+    Edge reading and writing through a row of an EdgeTable.
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def pair(self):
+        return self.table.pair(self.index)
+
+    @property
+    def value(self):
+        return self.table.value(self.index)
+
+    @value.setter
+    def value(self, value):
+        self.table.set_value(self.index, value)
+
+    def clone(self):
+        return Edge(pair=self.pair, value=self.value)
+
+    def __reduce__(self):
+        # views are pickled and copied as the detached edge they read
+        return Edge, (tuple(self.pair), self.value)
+
+
+def _mutator(name, after=None):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.version += 1
+        self.generation += 1
+        if after is not None:
+            after(self)
+        return result
+    wrapper.__name__ = name
+    return wrapper
+
+
+# row flags of EdgeTable.valued, integral rows hold ints in a float column
+_VALUED, _INTEGRAL = 1, 2
+_INT64_LIMIT = 1 << 63
+# floats hold every integer up to here exactly
+_FLOAT_INT_LIMIT = 1 << 53
+
+
+def weight_column(weights, valued):
+    # integral rows are only flagged in float columns, weights may be
+    # memoryviews of a mapped file
+    typecode = getattr(weights, 'typecode', None) or weights.format
+    if typecode == 'q' or _INTEGRAL not in valued:
+        return weights
+    return [int(weight) if flag == _INTEGRAL else weight
+            for weight, flag in zip(weights, valued)]
+
+
+class EdgeTable:
+    """
+    Columnar storage of edges: parallel source, target and weight arrays,
+    where sources and targets index the table own interned `labels`.
+    Rows are read as EdgeView objects, and mutations are counted in
+    `version`, those other than appends also in `generation`.
+
+    Weights are 64 bit integers until a float is stored, then the column
+    turns to floats and flags its integer rows, which read back as ints.
+    Integers must fit 64 bits, or 53 once the column holds floats.
+    """
+
+    def __init__(self, iterable=()):
+        self.labels = []
+        self.label_ids = {}
+        self.sources = array('q')
+        self.targets = array('q')
+        self.weights = array('q')
+        # tells which rows carries a value, non-weighted edges has none
+        self.valued = bytearray()
+        self.version = 0
+        self.generation = 0
+        self.extend(iterable)
+
+    @classmethod
+    def from_columns(cls, labels, sources, targets, weights, valued=None):
+        table = cls()
+        table.labels = list(labels)
+        for index, label in enumerate(table.labels):
+            table.label_ids.setdefault(label, index)
+        table.sources = array('q', sources)
+        table.targets = array('q', targets)
+        typecode = getattr(weights, 'typecode', None) or weights.format
+        table.weights = array(typecode, weights)
+        if valued is None:
+            valued = bytes([1]) * len(table.sources)
+        table.valued = bytearray(valued)
+        return table
+
+    def _intern(self, label):
+        label_id = self.label_ids.get(label)
+        if label_id is None:
+            label_id = self.label_ids[label] = len(self.labels)
+            self.labels.append(label)
+        return label_id
+
+    def _store(self, position, value):
+        if value is None:
+            self.weights[position] = 0
+            self.valued[position] = 0
+            return
+        if not isinstance(value, int):
+            if self.weights.typecode == 'q':
+                self._to_floats()
+            self.weights[position] = value
+            self.valued[position] = _VALUED
+            return
+        if not -_INT64_LIMIT <= value < _INT64_LIMIT:
+            raise ValueError(f'Edge weight [{value}] does not fit 64 bits.')
+        if self.weights.typecode == 'd':
+            if abs(value) > _FLOAT_INT_LIMIT:
+                raise ValueError(f'Edge weight [{value}] does not fit a float '
+                                 f'weights column.')
+            self.weights[position] = value
+            self.valued[position] = _INTEGRAL
+            return
+        self.weights[position] = value
+        self.valued[position] = _VALUED
+
+    def _to_floats(self):
+        weights, valued = self.weights, self.valued
+        for position, weight in enumerate(weights):
+            if valued[position] and abs(weight) > _FLOAT_INT_LIMIT:
+                raise ValueError(f'Edge weight [{weight}] does not fit a float '
+                                 f'weights column.')
+        self.weights = array('d', weights)
+        self.valued = valued.replace(bytes([_VALUED]), bytes([_INTEGRAL]))
+
+    def __len__(self):
+        return len(self.sources)
+
+    def __iter__(self):
+        for index in range(len(self.sources)):
+            yield EdgeView(self, index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [EdgeView(self, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('edge index out of range')
+        return EdgeView(self, index)
+
+    def __eq__(self, other):
+        if isinstance(other, EdgeTable):
+            return self.rows() == other.rows()
+        if isinstance(other, list):
+            return len(self) == len(other) and \
+                all(edge == other_edge for edge, other_edge in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def pair(self, index):
+        labels = self.labels
+        return labels[self.sources[index]], labels[self.targets[index]]
+
+    def value(self, index):
+        flag = self.valued[index]
+        if flag == _VALUED:
+            return self.weights[index]
+        if flag == _INTEGRAL:
+            return int(self.weights[index])
+        return None
+
+    def set_value(self, index, value):
+        self._store(index, value)
+        self.version += 1
+        self.generation += 1
+
+    def checkpoint(self):
+        return self.generation, len(self)
+
+    def appended_since(self, checkpoint):
+        """
+        Range of the row indexes appended since the checkpoint, None when
+        rows were changed otherwise.
+        """
+        generation, size = checkpoint
+        if generation != self.generation:
+            return None
+        return range(size, len(self))
+
+    def rows(self):
+        return [(*self.pair(index), self.value(index))
+                for index in range(len(self))]
+
+    def append(self, edge: Edge):
+        source, target = edge.pair
+        self.add(source, target, edge.value)
+
+    def add(self, source, target, value=None):
+        self.sources.append(self._intern(source))
+        self.targets.append(self._intern(target))
+        self.weights.append(0)
+        self.valued.append(0)
+        try:
+            self._store(len(self.sources) - 1, value)
+        except ValueError:
+            del self.sources[-1], self.targets[-1], self.weights[-1], \
+                self.valued[-1]
+            raise
+        self.version += 1
+
+    def extend(self, edges):
+        for edge in edges:
+            self.append(edge)
+
+    def __iadd__(self, edges):
+        self.extend(edges)
+        return self
+
+    def clear(self):
+        self.labels.clear()
+        self.label_ids.clear()
+        del self.sources[:], self.targets[:], self.weights[:], self.valued[:]
+        self.version += 1
+        self.generation += 1
+
+    def truncate(self, size):
+        # drop the rows past `size`, interned labels are kept
+        del self.sources[size:], self.targets[size:], \
+            self.weights[size:], self.valued[size:]
+        self.version += 1
+        self.generation += 1
+
+    def copy(self):
+        return EdgeTable.from_columns(self.labels, self.sources, self.targets,
+                                      self.weights, self.valued)
+
+    def index_columns(self, ids):
+        """
+        Returns the source and target columns translated to the indexes of
+        the `ids` label map, usually the graph vertices ids.
+        """
+        # labels left by truncated rows may be missing from `ids`
+        translation = [ids.get(label, -1) for label in self.labels]
+        sources = array('q', [translation[i] for i in self.sources])
+        targets = array('q', [translation[i] for i in self.targets])
+        for column, label_ids in ((sources, self.sources),
+                                  (targets, self.targets)):
+            if -1 in column:
+                raise KeyError(self.labels[label_ids[column.index(-1)]])
+        return sources, targets
+
+    def weight_column(self):
+        """
+        The weights column, as a list when integer rows share a float
+        column, so they are kept ints. Rows with no value weight 0.
+        """
+        return weight_column(self.weights, self.valued)
+
+    def argsort_weights(self):
+        # stable, so equal weights keep the insertion order
+        if numpy is not None:
+            weights = numpy.frombuffer(self.weights, dtype=self.weights.typecode)
+            return numpy.argsort(weights, kind='stable').tolist()
+        return sorted(range(len(self)), key=self.weights.__getitem__)
+
+
+class Vertices(list):
+    """
+    List of vertice labels which keeps an interned label to index map
+    in sync, so labels are resolved in constant time. Mutations are counted
+    in `version`, those other than appends also in `generation`.
+    """
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.version = 0
+        self.generation = 0
+        self._reindex()
+
+    def _reindex(self):
+        self.ids = {}
+        for index, label in enumerate(self):
+            # keep the first occurrence, like list.index
+            self.ids.setdefault(label, index)
+
+    def index(self, label, *args):
+        if args:
+            return super().index(label, *args)
+        try:
+            return self.ids[label]
+        except KeyError:
+            raise ValueError(f'{label!r} is not in list') from None
+
+    def __contains__(self, label):
+        return label in self.ids
+
+    def append(self, label):
+        self.ids.setdefault(label, len(self))
+        super().append(label)
+        self.version += 1
+
+    def extend(self, labels):
+        for label in labels:
+            self.append(label)
+
+    def __iadd__(self, labels):
+        self.extend(labels)
+        return self
+
+    def clear(self):
+        super().clear()
+        self.ids.clear()
+        self.version += 1
+        self.generation += 1
+
+    def checkpoint(self):
+        return self.generation, len(self)
+
+    def appended_since(self, checkpoint):
+        """
+        Range of the indexes appended since the checkpoint, None when labels
+        were changed otherwise.
+        """
+        generation, size = checkpoint
+        if generation != self.generation:
+            return None
+        return range(size, len(self))
+
+    def copy(self):
+        return Vertices(self)
+
+    def __reduce__(self):
+        # list pickling appends items before restoring the instance dict
+        return Vertices, (list(self),)
+
+    def truncate(self, size):
+        # drop the labels past `size`, without rebuilding the whole map
+        for index in range(size, len(self)):
+            label = list.__getitem__(self, index)
+            if self.ids.get(label) == index:
+                del self.ids[label]
+        list.__delitem__(self, slice(size, None))
+        self.version += 1
+        self.generation += 1
+
+    # any other change may shift indexes, rebuild the whole map
+    insert = _mutator('insert', after=_reindex)
+    remove = _mutator('remove', after=_reindex)
+    pop = _mutator('pop', after=_reindex)
+    sort = _mutator('sort', after=_reindex)
+    reverse = _mutator('reverse', after=_reindex)
+    __setitem__ = _mutator('__setitem__', after=_reindex)
+    __delitem__ = _mutator('__delitem__', after=_reindex)
+    __imul__ = _mutator('__imul__', after=_reindex)
 
 
 @dataclass
@@ -28,15 +407,86 @@ class Graph:
     name: str
     is_oriented: bool
     is_weighted: bool
-    vertices: list = field(default_factory=list)
-    edges: List[Edge] = field(default_factory=list)
+    vertices: Vertices = field(default_factory=Vertices)
+    edges: EdgeTable = field(default_factory=EdgeTable)
+
+    # how many derived representations are kept at once
+    cache_size = 8
+
+    def __setattr__(self, name, value):
+        if name == 'vertices' and not isinstance(value, Vertices):
+            value = Vertices(value)
+        elif name == 'edges' and not isinstance(value, EdgeTable):
+            value = EdgeTable(value)
+        super().__setattr__(name, value)
+
+        if not name.startswith('_'):
+            # replacing any field changes what representations look like
+            self._mutations = self.__dict__.get('_mutations', 0) + 1
+
+    @property
+    def version(self):
+        return self._mutations, self.vertices.version, self.edges.version
+
+    def representation(self, name, builder):
+        """
+        Returns the `name` representation built by `builder(self)`, reusing
+        the last one built for the current version. Cached values are shared,
+        so they must not be changed by callers.
+        """
+        cache = self.__dict__.setdefault('_representations', OrderedDict())
+        version = self.version
+        key = (name, version)
+
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        value = builder(self)
+
+        # entries of older versions can not be hit anymore
+        for stale_key in [k for k in cache if k[1] != version]:
+            del cache[stale_key]
+        cache[key] = value
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def checkpoint(self):
+        return (self._mutations, self.vertices.checkpoint(),
+                self.edges.checkpoint())
+
+    def appended_since(self, checkpoint):
+        """
+        Ranges of the vertice and edge indexes appended since the checkpoint,
+        None when the graph was changed otherwise.
+        """
+        mutations, vertices_checkpoint, edges_checkpoint = checkpoint
+        if mutations != self._mutations:
+            return None
+        vertices = self.vertices.appended_since(vertices_checkpoint)
+        edges = self.edges.appended_since(edges_checkpoint)
+        if vertices is None or edges is None:
+            return None
+        return vertices, edges
+
+    def add_edge(self, source, target, value=None):
+        """Appends the edge, appending its missing vertices first."""
+        for vertice in (source, target):
+            if not self.has_vertice(vertice):
+                self.vertices.append(vertice)
+        self.edges.add(source, target, value)
 
     def has_vertice(self, name):
-        try:
-            self.vertices.index(name)
-        except ValueError:
-            return False
-        return True
+        return name in self.vertices
+
+    def index_of(self, name):
+        return self.vertices.ids[name]
+
+    def edge_ids(self, edge: Edge):
+        source, target = edge.pair
+        ids = self.vertices.ids
+        return ids[source], ids[target]
 
     def clone(self):
         return Graph(name=self.name,
@@ -46,13 +496,187 @@ class Graph:
                      edges=self.edges.copy())
 
 
+@dataclass
+class CompactAdjacency:
+    """
+    Compressed sparse row adjacency. Neighbours of the vertice at index `i`
+    are at `targets[offsets[i]:offsets[i + 1]]`, weighted by the same slice
+    of `weights`, a list when it mixes integers and floats.
+    """
+    offsets: array
+    targets: array
+    weights: array
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def degree(self, index):
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def neighbour_indexes(self, index):
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    def neighbours(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+
+class DisjointSet:
+    """
+    Union-find over the indexes `0..size-1`, with path compression and
+    union by rank.
+    """
+
+    def __init__(self, size):
+        self.parents = list(range(size))
+        self.ranks = [0] * size
+
+    def find(self, item):
+        parents = self.parents
+        root = item
+        while parents[root] != root:
+            root = parents[root]
+
+        # point the whole path straight to the root
+        while parents[item] != root:
+            parents[item], item = root, parents[item]
+        return root
+
+    def union(self, item1, item2):
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return False
+
+        if self.ranks[root1] < self.ranks[root2]:
+            root1, root2 = root2, root1
+        self.parents[root2] = root1
+        if self.ranks[root1] == self.ranks[root2]:
+            self.ranks[root1] += 1
+        return True
+
+
+class IndexedHeap:
+    """
+    Binary min heap over the indexes `0..size-1`. Every index holds at most
+    one entry, whose key can be decreased in place.
+    """
+
+    def __init__(self, size):
+        self.items = []
+        self.keys = [None] * size
+        self.positions = [-1] * size
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return self.positions[item] != -1
+
+    def push(self, item, key):
+        position = self.positions[item]
+        if position == -1:
+            position = len(self.items)
+            self.items.append(item)
+            self.positions[item] = position
+        elif key > self.keys[item]:
+            raise ValueError(f'Key of [{item}] can only be decreased.')
+
+        self.keys[item] = key
+        self._sift_up(position)
+
+    def pop(self):
+        items = self.items
+        item = items[0]
+        last = items.pop()
+        self.positions[item] = -1
+
+        if items:
+            items[0] = last
+            self.positions[last] = 0
+            self._sift_down(0)
+        return item, self.keys[item]
+
+    def _less(self, item1, item2):
+        return (self.keys[item1], item1) < (self.keys[item2], item2)
+
+    def _move(self, item, position):
+        self.items[position] = item
+        self.positions[item] = position
+
+    def _sift_up(self, position):
+        item = self.items[position]
+        while position > 0:
+            parent_position = (position - 1) >> 1
+            parent = self.items[parent_position]
+            if not self._less(item, parent):
+                break
+            self._move(parent, position)
+            position = parent_position
+        self._move(item, position)
+
+    def _sift_down(self, position):
+        items = self.items
+        size = len(items)
+        item = items[position]
+        while True:
+            child_position = 2 * position + 1
+            if child_position >= size:
+                break
+            right_position = child_position + 1
+            if right_position < size and \
+                    self._less(items[right_position], items[child_position]):
+                child_position = right_position
+            child = items[child_position]
+            if not self._less(child, item):
+                break
+            self._move(child, position)
+            position = child_position
+        self._move(item, position)
+
+
 @dataclass
 class TransactionContext:
+    """
+    Graph being changed by a transaction. Contexts derived from each other
+    share the graph and an undo `journal`, where `position` is the journal
+    size when the context was created, so rolling back to it only undoes
+    the changes made since.
+    """
     graph: Graph
     previous_context: Any = None
     meta: dict = field(default_factory=dict)
+    journal: list = field(default_factory=list, repr=False)
+    position: int = None
+
+    def __post_init__(self):
+        if self.position is None:
+            self.position = len(self.journal)
+
+    def branch(self):
+        return TransactionContext(graph=self.graph,
+                                  previous_context=self.previous_context,
+                                  meta=self.meta.copy(),
+                                  journal=self.journal)
 
     def clone(self):
+        # detached copy, with its own graph and journal
         return TransactionContext(graph=self.graph.clone(),
                                   previous_context=self.previous_context,
                                   meta=self.meta.copy())
+
+    def add_vertice(self, vertice):
+        vertices = self.graph.vertices
+        self.journal.append(functools.partial(vertices.truncate, len(vertices)))
+        vertices.append(vertice)
+
+    def add_edge(self, edge: Edge):
+        edges = self.graph.edges
+        self.journal.append(functools.partial(edges.truncate, len(edges)))
+        edges.append(edge)
+
+    def rollback(self):
+        # undo every change made after this context was created
+        journal = self.journal
+        while len(journal) > self.position:
+            journal.pop()()
+        return self
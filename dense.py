@@ -0,0 +1,152 @@
+"""
+This module provides a NumPy engine for dense graphs, in the following:
+    - All pairs distances, by a blocked Floyd-Warshall
+    - Reachability and transitive closure, by boolean matrix powers
+
+Matrices are indexed by vertice indexes and built from the compact adjacent
+list. Updates run over chunks of lines, so temporaries stay bounded by
+`chunk_cells` cells whatever the graph size. Floyd-Warshall chunks default
+to a size that stays in the processor cache while a block of pivots runs.
+"""
+
+
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import logger
+import profiler
+from repr_types import compact_adjacent_list
+
+
+_logger = logger.get_logger('dense')
+
+
+def distance_matrix(graph, adjacency=None):
+    """
+    Matrix of the lightest edge between each pair of vertices, inf when
+    there is no edge and zero on the diagonal.
+    """
+    _require_numpy()
+    if adjacency is None:
+        adjacency = compact_adjacent_list(graph)
+    size = len(adjacency)
+
+    lines, columns, weights = _edge_columns(adjacency)
+    distances = numpy.full((size, size), math.inf)
+    numpy.minimum.at(distances, (lines, columns), weights)
+    numpy.fill_diagonal(distances, numpy.minimum(distances.diagonal(), 0))
+    return distances
+
+
+def floyd_warshall(distances, block_size=64, chunk_cells=1 << 15):
+    """
+    Closes the distance matrix in place, so each cell holds the shortest
+    path length between its vertices.
+
+    Pivots are taken by blocks: the diagonal block is closed first, then the
+    lines and columns crossing it, and finally every other line, which no
+    longer depends on the order of the pivots in the block. Blocks are views,
+    so every update lands in the matrix.
+    """
+    _require_numpy()
+    size = len(distances)
+    chunk_lines = max(1, chunk_cells // max(1, size))
+
+    for start in range(0, size, block_size):
+        block = slice(start, min(start + block_size, size))
+        pivots = range(block.start, block.stop)
+
+        diagonal = distances[block, block]
+        for pivot in pivots:
+            _relax(diagonal, diagonal[:, pivot - start],
+                   diagonal[pivot - start])
+
+        lines = distances[block]
+        for pivot in pivots:
+            _relax(lines, lines[:, pivot], lines[pivot - start])
+
+        for chunk in _chunks(size, chunk_lines):
+            columns = distances[chunk, block]
+            for pivot in pivots:
+                _relax(columns, columns[:, pivot - start],
+                       diagonal[pivot - start])
+
+        for chunk in _chunks(size, chunk_lines):
+            lines = distances[chunk]
+            for pivot in pivots:
+                _relax(lines, lines[:, pivot], distances[pivot])
+
+        profiler.count('pivots', len(pivots))
+        _logger.debug('pivots closed: %d of %d', block.stop, size)
+    return distances
+
+
+def all_pairs_distances(graph, adjacency=None, block_size=64,
+                        chunk_cells=1 << 15):
+    return floyd_warshall(distance_matrix(graph, adjacency=adjacency),
+                          block_size=block_size, chunk_cells=chunk_cells)
+
+
+def reachability_matrix(graph, adjacency=None):
+    """Boolean matrix of the edges, each vertice reaching itself."""
+    _require_numpy()
+    if adjacency is None:
+        adjacency = compact_adjacent_list(graph)
+    size = len(adjacency)
+
+    lines, columns, _ = _edge_columns(adjacency)
+    reachable = numpy.identity(size, dtype=bool)
+    reachable[lines, columns] = True
+    return reachable
+
+
+def transitive_closure(graph, adjacency=None, chunk_cells=1 << 22):
+    """
+    Boolean matrix telling which vertices each vertice reaches. The
+    reachability matrix is squared until it stops changing, so paths up to
+    twice as long are covered on each round, about log2(vertices) rounds.
+    """
+    reachable = reachability_matrix(graph, adjacency=adjacency)
+    size = len(reachable)
+    chunk_lines = max(1, chunk_cells // max(1, size))
+
+    rounds = 0
+    while True:
+        # float products go through BLAS and can not overflow back to zero
+        factor = reachable.astype(numpy.float32)
+        squared = numpy.empty_like(reachable)
+        for chunk in _chunks(size, chunk_lines):
+            numpy.greater(factor[chunk] @ factor, 0, out=squared[chunk])
+        rounds += 1
+        if numpy.array_equal(squared, reachable):
+            break
+        reachable = squared
+
+    profiler.count('squarings', rounds)
+    return reachable
+
+
+def _relax(lines, pivot_column, pivot_line):
+    numpy.minimum(lines, pivot_column[:, None] + pivot_line[None, :], out=lines)
+
+
+def _chunks(size, chunk_lines):
+    for start in range(0, size, chunk_lines):
+        yield slice(start, min(start + chunk_lines, size))
+
+
+def _edge_columns(adjacency):
+    offsets = numpy.asarray(adjacency.offsets, dtype=numpy.int64)
+    lines = numpy.repeat(numpy.arange(len(offsets) - 1), numpy.diff(offsets))
+    columns = numpy.asarray(adjacency.targets, dtype=numpy.int64)
+    weights = numpy.asarray(adjacency.weights, dtype=numpy.float64)
+    return lines, columns, weights
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError('The dense engine requires numpy.')
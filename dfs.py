@@ -2,12 +2,16 @@ from dataclasses import dataclass
 
 import logger
 import modeler
+import profiler
 import repr_types
 from util import show_banner
 
 
 _logger = logger.get_logger('dfs')
 
+VISIT = 'visit'
+COMPLETE = 'complete'
+
 
 @dataclass
 class Board:
@@ -19,45 +23,85 @@ class Board:
 
 def main():
     graph = modeler.parse_arguments()
-    table, timestamp = dfs_search(graph) 
-    printer = map(print, table)
-    show_banner('Results from Deepth First Search')
-    list(printer)
-    _logger.info('total timestamp: %d', timestamp)
+    with profiler.phase('representation'):
+        adjacency = repr_types.compact_adjacent_list(graph)
+    with profiler.phase('algorithm'):
+        table, timestamp = dfs_search(graph, adjacency)
+        table = list(table)
+    with profiler.phase('output'):
+        printer = map(print, table)
+        show_banner('Results from Deepth First Search')
+        list(printer)
+        _logger.info('total timestamp: %d', timestamp)
 
 
-def dfs_search(graph):
+def dfs_search(graph, adjacency=None):
     table = dict([(v, Board()) for v in graph.vertices])
-    adjacent_list = repr_types.adjacent_list(graph)    
+    timestamp = 0
 
-    def visit(exit_vertice, time, board):
-        board.visited = True
-        
-        time += 1
-        board.visit_timestamp = time
-        
-        def visit_and_store(vertice, *args):
-            board.entry = vertice
-            return visit(vertice, *args)
-        
-        index = graph.vertices.index(exit_vertice)
-        time = cycle_visiting(adjacent_list[index], visit_and_store, time=time)
-        
-        time += 1
-        board.completed_timestamp = time
-        return time
-
-
-    def cycle_visiting(vertices, callback, time=0):
-        for vertice in vertices:    
-            board = table[vertice]
-            if not board.visited:
-                time = callback(vertice, time, board)
-        return time
-    
-    timestamp = cycle_visiting(graph.vertices, visit)
+    for event, vertice, parent, timestamp in dfs_events(graph, adjacency):
+        board = table[vertice]
+        if event == VISIT:
+            board.visited = True
+            board.visit_timestamp = timestamp
+            if parent is not None:
+                # parents keep the last vertice entered from them
+                table[parent].entry = vertice
+        else:
+            board.completed_timestamp = timestamp
     return iter(table.values()), timestamp
 
 
+def dfs_events(graph, adjacency=None):
+    """
+    Yields (event, vertice, parent, timestamp) tuples, where event is VISIT
+    in pre-order and COMPLETE in post-order. Uses an explicit stack, so path
+    lengths are not bound to the recursion limit.
+    """
+    if adjacency is None:
+        adjacency = repr_types.compact_adjacent_list(graph)
+    offsets, targets = adjacency.offsets, adjacency.targets
+    vertices = graph.vertices
+
+    visited = [False] * len(adjacency)
+    time = 0
+    scanned = 0
+
+    for root in range(len(visited)):
+        if visited[root]:
+            continue
+        visited[root] = True
+        time += 1
+        yield VISIT, vertices[root], None, time
+
+        # vertices on the current path and their next neighbour position
+        stack, cursors = [root], [offsets[root]]
+        while stack:
+            index = stack[-1]
+            cursor, end = cursors[-1], offsets[index + 1]
+            while cursor < end and visited[targets[cursor]]:
+                cursor += 1
+            scanned += cursor - cursors[-1]
+
+            if cursor < end:
+                scanned += 1
+                cursors[-1] = cursor + 1
+                child = targets[cursor]
+                visited[child] = True
+                time += 1
+                yield VISIT, vertices[child], vertices[index], time
+                stack.append(child)
+                cursors.append(offsets[child])
+            else:
+                stack.pop()
+                cursors.pop()
+                time += 1
+                parent = vertices[stack[-1]] if stack else None
+                yield COMPLETE, vertices[index], parent, time
+
+    profiler.count('vertices visited', len(visited))
+    profiler.count('edges scanned', scanned)
+
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
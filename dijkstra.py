@@ -1,10 +1,12 @@
+import heapq
 import math
 from dataclasses import dataclass
 
 import logger
 import modeler
+import profiler
 from util import read_choices, show_banner
-from repr_types import adjacent_list, adjacent_matrix
+from repr_types import compact_adjacent_list
 
 
 _logger = logger.get_logger('dijkstra')
@@ -24,9 +26,14 @@ def main():
     index = read_choices('What is the vertice to start', choices)
     vertice = choices[index]
     _logger.info('starting from vertice: %s', vertice)    
-    printer = map(_logger.info, search(graph, vertice))
-    show_banner('Dijkstra items from search', separator='@')
-    list(printer)
+    with profiler.phase('representation'):
+        adjacency = compact_adjacent_list(graph)
+    with profiler.phase('algorithm'):
+        items = list(search(graph, vertice, adjacency=adjacency))
+    with profiler.phase('output'):
+        printer = map(_logger.info, items)
+        show_banner('Dijkstra items from search', separator='@')
+        list(printer)
 
 
 def load_vertice_items(graph, source_vertice):
@@ -40,34 +47,77 @@ def load_vertice_items(graph, source_vertice):
     return all_items
     
 
-def search(graph, source_vertice):
-    graph_adj_list = adjacent_list(graph)
-    graph_adj_matrix = adjacent_matrix(graph)
+def search(graph, source_vertice, target=None, adjacency=None):
+    if adjacency is None:
+        adjacency = compact_adjacent_list(graph)
+    target_index = None if target is None else graph.index_of(target)
+    metrics, parents = shortest_paths(adjacency, graph.index_of(source_vertice),
+                                      target_index=target_index)
 
     all_items = load_vertice_items(graph, source_vertice)
-    
-    queue = all_items.copy() 
-    queue = sorted(queue, key=lambda k: queue[k].metric, reverse=True)
-    _logger.debug('queue: %s', queue) 
+    vertices = graph.vertices
+    for item in all_items.values():
+        item.metric = metrics[item.index]
+        parent = parents[item.index]
+        if parent != -1:
+            item.path = vertices[parent]
+    return iter(all_items.values())
+
+
+def shortest_paths(adjacency, source_index, target_index=None):
+    """
+    Dijkstra over vertice indexes of a compact adjacency. Returns the metric
+    and the parent index of every vertice, -1 for the source and unreached
+    vertices. Stops once the target index is settled, when given, and then
+    reports the vertices not settled yet as unreached, their tentative
+    metrics not being final.
+    """
+    debug = _logger.hot_path()
+
+    size = len(adjacency)
+    metrics = [math.inf] * size
+    parents = [-1] * size
+    settled = [False] * size
+    metrics[source_index] = 0
+
+    # binary heap of (metric, index), outdated entries are skipped when popped
+    queue = [(0, source_index)]
+    scanned = relaxed = 0
 
     while len(queue):
-        min_vertice = queue.pop()
-        current_v = all_items[min_vertice]
-        _logger.debug('vertice item: %s', current_v)
-        for neighbour in graph_adj_list[current_v.index]:
-            _logger.debug('vertice: %s', neighbour)
-            neighbour_index = all_items[neighbour].index
-            len_between_vertices = graph_adj_matrix[current_v.index][neighbour_index]
-            
-            alt_len = current_v.metric + len_between_vertices
-            current_length = all_items[neighbour].metric            
-            
-            if alt_len < current_length:                      
-                all_items[neighbour].metric = alt_len
-                all_items[neighbour].path = current_v.vertice
-                _logger.debug('new info: %s', all_items[neighbour])
-            _logger.debug('queue: %s', queue)
-    return iter(all_items.values())
+        metric, index = heapq.heappop(queue)
+        if settled[index]:
+            continue
+        settled[index] = True
+
+        if debug:
+            debug('vertice index: %d, metric: %s', index, metric)
+        if index == target_index:
+            for other_index in range(size):
+                if not settled[other_index]:
+                    metrics[other_index] = math.inf
+                    parents[other_index] = -1
+            break
+
+        for neighbour_index, len_between_vertices in adjacency.neighbours(index):
+            scanned += 1
+            if settled[neighbour_index]:
+                continue
+            alt_len = metric + len_between_vertices
+
+            if alt_len < metrics[neighbour_index]:
+                metrics[neighbour_index] = alt_len
+                parents[neighbour_index] = index
+                heapq.heappush(queue, (alt_len, neighbour_index))
+                relaxed += 1
+                if debug:
+                    debug('new info: index %d, metric %s, parent %d',
+                          neighbour_index, alt_len, index)
+
+    profiler.count('heap pushes', relaxed + 1)
+    profiler.count('edges scanned', scanned)
+    profiler.count('edges relaxed', relaxed)
+    return metrics, parents
 
 
 if __name__ == '__main__':
@@ -0,0 +1,159 @@
+"""
+This module keeps a minimum spanning tree up to date while edges are added
+to its graph.
+
+The tree is seeded by Kruskal or Prim-Jarnik, then each new edge closes a
+cycle with the tree path between its vertices: it replaces the heaviest
+edge of that path when lighter, or joins two trees of the forest when there
+is no path. Every insertion costs one walk over a tree, O(V).
+"""
+
+
+import logger
+import profiler
+import kruskal
+import prim_jarnik
+
+
+_logger = logger.get_logger('dynamic_mst')
+
+SEEDS = {
+    'kruskal': kruskal.min_spanning_tree,
+    'prim': prim_jarnik.min_spanning_tree,
+}
+
+
+def spanning_tree(graph, algorithm='kruskal'):
+    """
+    Returns the dynamic spanning tree kept on the graph, seeding it on the
+    first call and catching up with the edges appended since the last one.
+    """
+    tree = graph.__dict__.get('_spanning_tree')
+    if tree is None or tree.algorithm != algorithm:
+        tree = graph._spanning_tree = DynamicSpanningTree(graph, algorithm)
+    else:
+        tree.update()
+    return tree
+
+
+class DynamicSpanningTree:
+    """
+    Minimum spanning forest of a non-oriented graph, by edge indexes of the
+    graph edges table. Changes other than appended edges make it seed again.
+    """
+
+    def __init__(self, graph, algorithm='kruskal'):
+        if graph.is_oriented:
+            raise ValueError('Minimum spanning trees requires non-oriented '
+                             'graphs.')
+        if not graph.is_weighted:
+            raise ValueError('Minimum spanning trees requires weighted graphs.')
+        if algorithm not in SEEDS:
+            raise ValueError(f'Unknown spanning tree algorithm [{algorithm}].')
+        self.graph = graph
+        self.algorithm = algorithm
+        self.seed()
+
+    def seed(self):
+        graph = self.graph
+        # tree neighbours of each vertice label, by the edge index joining them
+        self.adjacent = {}
+        self.indexes = set()
+        self.weight = 0
+        for edge in SEEDS[self.algorithm](graph):
+            self._link(edge.index)
+
+        self.checkpoint = graph.checkpoint()
+        profiler.count('seeds')
+        _logger.debug('seeded %s tree: %d edges, weight %s', self.algorithm,
+                      len(self.indexes), self.weight)
+
+    def update(self):
+        """Inserts the edges appended to the graph since the last update."""
+        appended = self.graph.appended_since(self.checkpoint)
+        if appended is None:
+            self.seed()
+            return
+        for index in appended[1]:
+            self.insert(index)
+        self.checkpoint = self.graph.checkpoint()
+
+    def add_edge(self, source, target, value):
+        """Appends the edge to the graph, with missing vertices, and inserts it."""
+        self.update()
+        self.graph.add_edge(source, target, value)
+        self.update()
+
+    def insert(self, index):
+        """
+        Inserts the edge at index of the graph edges table, returning the
+        edge index it replaced, None when the tree was only extended or
+        kept as it was.
+        """
+        source, target = self.graph.edges.pair(index)
+        value = self.graph.edges.value(index)
+        profiler.count('edges inserted')
+        if source == target:
+            return None
+
+        path = self._path(source, target)
+        if path is None:    # joins two trees of the forest
+            self._link(index)
+            return None
+
+        value_of = self.graph.edges.value
+        heaviest = max(path, key=value_of)
+        if value_of(heaviest) <= value:
+            return None
+
+        self._unlink(heaviest)
+        self._link(index)
+        profiler.count('edges replaced')
+        _logger.debug('edge %d replaced edge %d', index, heaviest)
+        return heaviest
+
+    def _path(self, source, target):
+        # edge indexes of the tree path, None when not in the same tree
+        adjacent = self.adjacent
+        if source not in adjacent or target not in adjacent:
+            return None
+        parents = {source: None}
+        stack = [source]
+        while stack:
+            vertice = stack.pop()
+            if vertice == target:
+                break
+            for neighbour, index in adjacent[vertice].items():
+                if neighbour not in parents:
+                    parents[neighbour] = (vertice, index)
+                    stack.append(neighbour)
+        else:
+            return None
+
+        path = []
+        vertice = target
+        while parents[vertice] is not None:
+            vertice, index = parents[vertice]
+            path.append(index)
+        return path
+
+    def _link(self, index):
+        source, target = self.graph.edges.pair(index)
+        self.adjacent.setdefault(source, {})[target] = index
+        self.adjacent.setdefault(target, {})[source] = index
+        self.indexes.add(index)
+        self.weight += self.graph.edges.value(index)
+
+    def _unlink(self, index):
+        source, target = self.graph.edges.pair(index)
+        del self.adjacent[source][target]
+        del self.adjacent[target][source]
+        self.indexes.remove(index)
+        self.weight -= self.graph.edges.value(index)
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __iter__(self):
+        edges = self.graph.edges
+        return (edges[index] for index in sorted(self.indexes))
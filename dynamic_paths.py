@@ -0,0 +1,240 @@
+"""
+This module keeps a shortest path tree up to date while the edges of its
+graph are added or have their weights changed.
+
+Inserted edges and decreased weights relax the edge ends and run Dijkstra
+only from the vertices they improved. An increased weight on a tree edge
+detaches the subtree under it, seeds each detached vertice from its best
+neighbour outside the subtree, then runs Dijkstra over the subtree alone.
+Weights must not be negative.
+"""
+
+
+import heapq
+import math
+
+import logger
+import profiler
+from dijkstra import DijkstraItem
+
+
+_logger = logger.get_logger('dynamic_paths')
+
+
+def shortest_path_tree(graph, source):
+    """
+    Returns the shortest path tree from source kept on the graph, building
+    it on the first call and catching up with the edges appended since the
+    last one.
+    """
+    trees = graph.__dict__.setdefault('_path_trees', {})
+    tree = trees.get(source)
+    if tree is None:
+        tree = trees[source] = ShortestPathTree(graph, source)
+    else:
+        tree.update()
+    return tree
+
+
+class ShortestPathTree:
+    """
+    Metric and parent edge of every vertice index, the parent edges forming
+    the tree. Changes other than appended vertices and edges, or weights set
+    through `set_weight`, make it build again.
+    """
+
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self.build()
+
+    def build(self):
+        graph = self.graph
+        size = len(graph.vertices)
+        self.source_index = graph.index_of(self.source)
+
+        self.sources, self.targets = graph.edges.index_columns(graph.vertices.ids)
+        self.outgoing = [[] for _ in range(size)]
+        # non-oriented edges are walked both ways, so they come in as they go out
+        self.incoming = self.outgoing
+        if graph.is_oriented:
+            self.incoming = [[] for _ in range(size)]
+        for index in range(len(self.sources)):
+            self._connect(index)
+
+        self.metrics = [math.inf] * size
+        # edge index reaching each vertice, -1 for the source and unreached
+        self.parents = [-1] * size
+        self.children = [set() for _ in range(size)]
+        self.metrics[self.source_index] = 0
+        self._propagate([(0, self.source_index)])
+
+        self.checkpoint = graph.checkpoint()
+        profiler.count('builds')
+
+    def update(self):
+        """Inserts the edges appended to the graph since the last update."""
+        appended = self.graph.appended_since(self.checkpoint)
+        if appended is None:
+            self.build()
+            return
+        self._grow()
+        ids = self.graph.vertices.ids
+        edges = self.graph.edges
+        for index in appended[1]:
+            source, target = edges.pair(index)
+            self.sources.append(ids[source])
+            self.targets.append(ids[target])
+            self._connect(index)
+            self._relax_edge(index)
+        self.checkpoint = self.graph.checkpoint()
+
+    def add_edge(self, source, target, value=None):
+        """Appends the edge to the graph, with missing vertices, and inserts it."""
+        self.update()
+        self.graph.add_edge(source, target, value)
+        self.update()
+
+    def set_weight(self, index, value):
+        """Changes the weight of the edge at index, repairing the tree."""
+        self.update()
+        previous = self._weight(index)
+        self.graph.edges.set_value(index, value)
+        self.checkpoint = self.graph.checkpoint()
+
+        if value < previous:
+            self._relax_edge(index)
+        elif value > previous:
+            self._raise_edge(index)
+
+    def metric(self, vertice):
+        return self.metrics[self.graph.index_of(vertice)]
+
+    def path(self, vertice):
+        """Vertices from the source to vertice, empty when unreached."""
+        index = self.graph.index_of(vertice)
+        if self.metrics[index] == math.inf:
+            return []
+        vertices = self.graph.vertices
+        path = [vertices[index]]
+        while self.parents[index] != -1:
+            index = self._other(self.parents[index], index)
+            path.append(vertices[index])
+        return path[::-1]
+
+    def items(self):
+        """The DijkstraItem table `dijkstra.search` would give."""
+        vertices = self.graph.vertices
+        for index, vertice in enumerate(vertices):
+            parent = self.parents[index]
+            path = None
+            if parent != -1:
+                path = vertices[self._other(parent, index)]
+            yield DijkstraItem(vertice=vertice, index=index, path=path,
+                               metric=self.metrics[index])
+
+    def _weight(self, index):
+        if self.graph.is_weighted:
+            return self.graph.edges.value(index)
+        return 1
+
+    def _other(self, index, vertice_index):
+        # the end of the edge at index which is not vertice_index
+        source = self.sources[index]
+        return self.targets[index] if source == vertice_index else source
+
+    def _connect(self, index):
+        source, target = self.sources[index], self.targets[index]
+        self.outgoing[source].append(index)
+        if source != target:
+            self.incoming[target].append(index)
+
+    def _grow(self):
+        for _ in range(len(self.metrics), len(self.graph.vertices)):
+            self.outgoing.append([])
+            if self.incoming is not self.outgoing:
+                self.incoming.append([])
+            self.metrics.append(math.inf)
+            self.parents.append(-1)
+            self.children.append(set())
+
+    def _directions(self, index):
+        source, target = self.sources[index], self.targets[index]
+        if self.graph.is_oriented:
+            return ((source, target),)
+        return ((source, target), (target, source))
+
+    def _set_parent(self, vertice_index, index):
+        previous = self.parents[vertice_index]
+        if previous != -1:
+            self.children[self._other(previous, vertice_index)] \
+                .discard(vertice_index)
+        self.parents[vertice_index] = index
+        if index != -1:
+            self.children[self._other(index, vertice_index)].add(vertice_index)
+
+    def _relax_edge(self, index):
+        metrics = self.metrics
+        weight = self._weight(index)
+        queue = []
+        for tail, head in self._directions(index):
+            metric = metrics[tail] + weight
+            if metric < metrics[head]:
+                metrics[head] = metric
+                self._set_parent(head, index)
+                queue.append((metric, head))
+        self._propagate(queue)
+
+    def _raise_edge(self, index):
+        roots = [head for _, head in self._directions(index)
+                 if self.parents[head] == index]
+        if not roots:   # not a tree edge, no path gets longer
+            return
+
+        affected = []
+        stack = roots
+        while stack:
+            vertice_index = stack.pop()
+            affected.append(vertice_index)
+            stack.extend(self.children[vertice_index])
+
+        metrics = self.metrics
+        for vertice_index in affected:
+            metrics[vertice_index] = math.inf
+            self._set_parent(vertice_index, -1)
+
+        # best way into the subtree from the vertices left untouched
+        queue = []
+        for vertice_index in affected:
+            for edge_index in self.incoming[vertice_index]:
+                tail = self._other(edge_index, vertice_index)
+                metric = metrics[tail] + self._weight(edge_index)
+                if metric < metrics[vertice_index]:
+                    metrics[vertice_index] = metric
+                    self._set_parent(vertice_index, edge_index)
+            if metrics[vertice_index] < math.inf:
+                queue.append((metrics[vertice_index], vertice_index))
+
+        profiler.count('vertices repaired', len(affected))
+        _logger.debug('edge %d raised, %d vertices repaired', index,
+                      len(affected))
+        self._propagate(queue)
+
+    def _propagate(self, queue):
+        # Dijkstra from the queued vertices, outdated entries are skipped
+        metrics, outgoing = self.metrics, self.outgoing
+        heapq.heapify(queue)
+        relaxed = 0
+        while queue:
+            metric, vertice_index = heapq.heappop(queue)
+            if metric > metrics[vertice_index]:
+                continue
+            for index in outgoing[vertice_index]:
+                neighbour = self._other(index, vertice_index)
+                alt_len = metric + self._weight(index)
+                if alt_len < metrics[neighbour]:
+                    metrics[neighbour] = alt_len
+                    self._set_parent(neighbour, index)
+                    heapq.heappush(queue, (alt_len, neighbour))
+                    relaxed += 1
+        profiler.count('edges relaxed', relaxed)
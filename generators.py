@@ -0,0 +1,96 @@
+"""
+This module provides reproducible synthetic graphs, in the following:
+    - Random graph, with a fixed number of edges
+    - Grid graph
+    - Scale-free graph, by preferential attachment
+    - Complete graph
+
+Vertices are labeled by their index, and every generator takes a seed so the
+same arguments always produce the same graph.
+"""
+
+
+import random
+
+from data_structures import Graph
+
+
+def random_graph(vertices_size, edges_size, seed=0, is_oriented=False,
+                 is_weighted=True, max_weight=100):
+    rand = random.Random(seed)
+    graph = _empty_graph(f'random-{vertices_size}-{edges_size}-{seed}',
+                         vertices_size, is_oriented, is_weighted)
+    # loops are skipped, so tiny graphs can still finish
+    attempts = 0
+    while len(graph.edges) < edges_size and attempts < 10 * edges_size:
+        attempts += 1
+        source = rand.randrange(vertices_size)
+        target = rand.randrange(vertices_size)
+        if source != target:
+            _add_edge(graph, source, target, rand, max_weight)
+    return graph
+
+
+def grid_graph(lines, columns, seed=0, is_oriented=False, is_weighted=True,
+               max_weight=100):
+    rand = random.Random(seed)
+    graph = _empty_graph(f'grid-{lines}x{columns}-{seed}', lines * columns,
+                         is_oriented, is_weighted)
+    for line in range(lines):
+        for column in range(columns):
+            index = line * columns + column
+            if column + 1 < columns:
+                _add_edge(graph, index, index + 1, rand, max_weight)
+            if line + 1 < lines:
+                _add_edge(graph, index, index + columns, rand, max_weight)
+    return graph
+
+
+def grid_coordinates(lines, columns):
+    # (line, column) of each grid_graph vertice label
+    return {str(line * columns + column): (line, column)
+            for line in range(lines) for column in range(columns)}
+
+
+def scale_free_graph(vertices_size, attachment=2, seed=0, is_oriented=False,
+                     is_weighted=True, max_weight=100):
+    rand = random.Random(seed)
+    graph = _empty_graph(f'scale-free-{vertices_size}-{attachment}-{seed}',
+                         vertices_size, is_oriented, is_weighted)
+    # every vertice appears once per edge end, so picking from it
+    # prefers the vertices with higher degrees
+    ends = []
+    for index in range(1, vertices_size):
+        if not ends:
+            targets = {0}
+        else:
+            targets = set()
+            while len(targets) < min(attachment, index):
+                targets.add(rand.choice(ends))
+        for target in sorted(targets):
+            _add_edge(graph, index, target, rand, max_weight)
+            ends.extend((index, target))
+    return graph
+
+
+def complete_graph(vertices_size, seed=0, is_oriented=False, is_weighted=True,
+                   max_weight=100):
+    rand = random.Random(seed)
+    graph = _empty_graph(f'complete-{vertices_size}-{seed}', vertices_size,
+                         is_oriented, is_weighted)
+    for source in range(vertices_size):
+        for target in range(source + 1, vertices_size):
+            _add_edge(graph, source, target, rand, max_weight)
+    return graph
+
+
+def _empty_graph(name, vertices_size, is_oriented, is_weighted):
+    return Graph(name=name,
+                 is_oriented=is_oriented,
+                 is_weighted=is_weighted,
+                 vertices=[str(index) for index in range(vertices_size)])
+
+
+def _add_edge(graph, source, target, rand, max_weight):
+    value = rand.randint(1, max_weight) if graph.is_weighted else None
+    graph.edges.add(str(source), str(target), value)
@@ -1,7 +1,8 @@
 from util import show_banner, display_table
 import logger
 import modeler
-import repr_types
+import profiler
+from data_structures import DisjointSet
 
 
 _logger = logger.get_logger('kruskal')
@@ -15,31 +16,40 @@ def spanning_tree_graph():
 
 def main():
     graph = spanning_tree_graph()
-    printer = map(_logger.info, min_spanning_tree(graph))
-    show_banner('Edges from Kruskal algo', separator='&')
-    list(printer)
+    with profiler.phase('algorithm'):
+        edges = list(min_spanning_tree(graph))
+    with profiler.phase('output'):
+        printer = map(_logger.info, edges)
+        show_banner('Edges from Kruskal algo', separator='&')
+        list(printer)
 
 
 def min_spanning_tree(graph):
-    all_items = {}
-
-    for vertice in graph.vertices:
-        all_items[vertice] = [vertice]
-
-    adj_matrix = repr_types.adjacent_matrix(graph)
-    queue = sorted(graph.edges, key=lambda e: e.value)
-    _logger.debug('queue: %s', queue) 
-
-    for edge in queue:
-        _logger.debug('edge: %s', edge)
-        item1 = all_items[edge.pair[0]]
-        item2 = all_items[edge.pair[1]]
-        if item1 == item2: continue
-        item1.extend(item2)
-        for vertice in item2:
-            all_items[vertice] = item1
+    components = DisjointSet(len(graph.vertices))
+    remaining = len(graph.vertices) - 1
+
+    edges = graph.edges
+    sources, targets = edges.index_columns(graph.vertices.ids)
+    queue = edges.argsort_weights()
+    debug = _logger.hot_path()
+
+    scanned = unions = 0
+    for index in queue:
+        if remaining <= 0:
+            break
+        scanned += 1
+        if not components.union(sources[index], targets[index]):
+            continue
+        unions += 1
+        remaining -= 1
+        edge = edges[index]
+        if debug:
+            debug('edge: %s', edge)
         yield edge
 
+    profiler.count('edges scanned', scanned)
+    profiler.count('unions', unions)
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,26 +1,38 @@
+import functools
 import logging
 import sys
 import traceback
 
 
 class DeferredLogger:
+    __mixins__ = frozenset(dir(logging.Logger))
+
     def __init__(self, name):
         self.name = name
         self.instance = None
-        self.__mixins__ = dir(logging.Logger)
-        self.__passthrough__ = ['__passthrough__', '__mixins__', 'name', 'instance']
-
-    def __getattribute__(self, name):
-        if name in super().__getattribute__('__passthrough__'):
-            return super().__getattribute__(name)
-        
-        if name in iter(self.__mixins__):
-            if self.instance is None:
-                self.instance = logging.getLogger(self.name)  
-            method = getattr(self.instance, name)
-            assert method is not None, f'Logger mixin not found for [{name}]'
-            return method
-        raise KeyError(f'Item was not found for [{name}]')
+
+    def __getattr__(self, name):
+        # only reached on the first access, the bound method is then cached
+        # as an instance attribute and found by the regular lookup
+        if name not in DeferredLogger.__mixins__:
+            raise AttributeError(f'Item was not found for [{name}]')
+
+        if self.instance is None:
+            self.instance = logging.getLogger(self.name)
+        method = getattr(self.instance, name)
+        assert method is not None, f'Logger mixin not found for [{name}]'
+        setattr(self, name, method)
+        return method
+
+    def hot_path(self, level=logging.DEBUG):
+        """
+        Returns the logging method for `level` when it is enabled, None
+        otherwise. Resolve it once before a loop and guard each call with
+        `if log:`, so disabled logging costs neither a call nor formatting.
+        """
+        if not self.isEnabledFor(level):
+            return None
+        return functools.partial(self.log, level)
 
 
 def get_logger(name):
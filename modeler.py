@@ -1,14 +1,26 @@
-from dataclasses import asdict
 import argparse
+import codecs
+import csv
+import itertools
 import json
 import secrets
 import os
 
+import binary_graph
 import logger
+import profiler
 from contextual_modeler import model_graph_vertices
 from data_structures import Graph, Edge
 from util import read_text, read_choices, display_table, show_banner
-from repr_types import maybe_remove_duplicate_edges, is_graph
+from repr_types import (maybe_remove_duplicate_edges,
+    is_graph,
+    CompactAdjacencyBuilder)
+
+
+EDGE_COLUMNS = ('source', 'target', 'weight')
+
+# top level keys of graph files read into the graph, others are ignored
+GRAPH_FIELDS = ('name', 'is_oriented', 'is_weighted')
 
 
 _logger = logger.get_logger('modeler')
@@ -61,26 +73,103 @@ def create_graph_from_interaction():
     _logger.info('graph created: %s', graph)
 
     def modeler():
-        context = model_graph_vertices(graph=graph)
+        # each attempt starts over, so rejected ones leave nothing behind
+        context = model_graph_vertices(graph=graph.clone())
         return context.graph
 
     while True:
-        graph = prompt_forever('New info sounds good?', modeler)
-        _logger.info('graph modeled: %s', graph)
-        if not is_graph(graph):
+        modeled_graph = prompt_forever('New info sounds good?', modeler)
+        _logger.info('graph modeled: %s', modeled_graph)
+        if not is_graph(modeled_graph):
             _logger.info('The graph inserted could not exist. Improper edges!')
             _logger.info('Try it again.')
-            graph.edges.clear()
-            graph.vertices.clear()
         else:
             _logger.debug('graph exists')
             break
 
-    return maybe_remove_duplicate_edges(graph)
+    return maybe_remove_duplicate_edges(modeled_graph)
+
+
+def create_graph_from_edges(io_wrapper, name=None, is_oriented=False,
+                            is_weighted=False, delimiter=',', batch_size=10000):
+    """
+    Builds a graph from delimited `source, target[, weight]` rows. An
+    optional header row naming those columns marks the graph as weighted
+    when it has a weight column.
+    """
+    rows = csv.reader(io_wrapper, delimiter=delimiter)
+    line_number = 0
+
+    first_row = next(rows, None)
+    if first_row is not None:
+        header = [column.strip().lower() for column in first_row]
+        if header and set(header) <= set(EDGE_COLUMNS):
+            is_weighted = is_weighted or 'weight' in header
+            line_number = 1
+        else:   # not a header, read it as an edge
+            rows = itertools.chain([first_row], rows)
+
+    if name is None:
+        name = secrets.token_hex(6)
+    graph = Graph(name=name, is_oriented=is_oriented, is_weighted=is_weighted)
+    vertices, edges = graph.vertices, graph.edges
+    # canonical pairs already stored, non-oriented graphs only
+    seen_pairs = set()
+
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+
+        for row in batch:
+            line_number += 1
+            if not row or row[0].startswith('#'):
+                continue
+            if len(row) < 2:
+                raise ValueError(f'Line {line_number}: expecting at least '
+                                 f'source and target vertices.')
+            source, target = row[0].strip(), row[1].strip()
+            value = None
+            if is_weighted:
+                value = _parse_weight(row, line_number)
+
+            for vertice in (source, target):
+                if vertice not in vertices:
+                    vertices.append(vertice)
+
+            if not is_oriented:
+                key = frozenset((source, target))
+                if key in seen_pairs:
+                    continue
+                seen_pairs.add(key)
+            edges.add(source, target, value)
+
+        _logger.info('imported edges: %d', len(edges))
+
+    if not is_graph(graph):
+        raise ValueError('The imported graph could not exist. Improper edges!')
+    return graph
+
+
+def _parse_weight(row, line_number):
+    try:
+        text = row[2].strip()
+    except IndexError:
+        raise ValueError(f'Line {line_number}: weighted graphs requires '
+                         f'a weight column.') from None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f'Line {line_number}: weight must be a number, '
+                         f'found [{text}].') from None
 
 
 def dumps(graph, directory=''):
-    dict_repr = asdict(graph)
+    dict_repr = graph_dict(graph)
     filename = f'{graph.name}.json'
 
     # handle a target directory
@@ -94,24 +183,166 @@ def dumps(graph, directory=''):
     _logger.debug(f'graph was written to: {filename}')
 
 
+def graph_dict(graph):
+    return {
+        'name': graph.name,
+        'is_oriented': graph.is_oriented,
+        'is_weighted': graph.is_weighted,
+        'vertices': list(graph.vertices),
+        'edges': [{'pair': list(edge.pair), 'value': edge.value}
+                  for edge in graph.edges],
+    }
+
+
 def read_graph(io_wrapper):
-    content = json.load(io_wrapper)
+    if binary_graph.is_binary(io_wrapper):
+        return binary_graph.read_graph(io_wrapper)
+
+    graph = Graph(name=None, is_oriented=False, is_weighted=False)
+
+    for key, value in _read_graph_fields(io_wrapper):
+        if key == 'vertices':
+            graph.vertices.extend(value)
+        elif key == 'edges':
+            append = graph.edges.append
+            for edge in value:
+                append(Edge(tuple(edge['pair']), value=edge['value']))
+        elif key in GRAPH_FIELDS:
+            setattr(graph, key, value)
     io_wrapper.close()
 
-    graph = Graph(name=content['name'], is_oriented=content['is_oriented'],
-                  is_weighted=content['is_weighted'], vertices=content['vertices'])
+    _logger.debug('graph reborned: %s', graph)
+    return graph
+
+
+def read_compact_graph(io_wrapper):
+    """
+    Reads the graph vertices and feeds its edges straight into a compact
+    adjacent list, without keeping Edge objects. Expects the fields order
+    written by dumps, vertices and flags before edges.
+    """
+    if binary_graph.is_binary(io_wrapper):
+        return binary_graph.read_compact_graph(io_wrapper)
+
+    graph = Graph(name=None, is_oriented=False, is_weighted=False)
+    builder = CompactAdjacencyBuilder()
+
+    for key, value in _read_graph_fields(io_wrapper):
+        if key == 'vertices':
+            graph.vertices.extend(value)
+        elif key == 'edges':
+            ids = graph.vertices.ids
+            for edge in value:
+                pair = edge['pair']
+                weight = edge['value'] if graph.is_weighted else 1
+                if weight is None:  # as edge table rows with no value
+                    weight = 0
+                builder.add(ids[pair[0]], ids[pair[1]], weight)
+        elif key in GRAPH_FIELDS:
+            setattr(graph, key, value)
+    io_wrapper.close()
 
     _logger.debug('graph reborned: %s', graph)
+    return graph, builder.build(len(graph.vertices), graph.is_oriented)
+
+
+class _JsonStream:
+    """
+    Incremental reader of one JSON document, decoding one value at a time
+    from a buffer refilled in chunks.
+    """
+
+    def __init__(self, io_wrapper, chunk_size=1 << 16):
+        self.io_wrapper = io_wrapper
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.exhausted = False
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def fill(self):
+        chunk = self.io_wrapper.read(self.chunk_size)
+        if not chunk:
+            self.exhausted = True
+        if isinstance(chunk, bytes):
+            # a split multi-byte character decodes to nothing until completed
+            chunk = self.text_decoder.decode(chunk, final=self.exhausted)
+        # drop what was already consumed
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+    def peek(self):
+        while True:
+            buffer = self.buffer
+            size = len(buffer)
+            while self.position < size and buffer[self.position] in ' \t\n\r':
+                self.position += 1
+            if self.position < size or self.exhausted:
+                return buffer[self.position:self.position + 1]
+            self.fill()
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f'Malformed graph file, expecting one of '
+                             f'[{chars}] but found [{char}].')
+        self.position += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+                self.fill()
+                continue
+            # numbers may continue on the next chunk
+            if end == len(self.buffer) and not self.exhausted:
+                self.fill()
+                continue
+            self.position = end
+            return value
+
+    def items(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def _read_graph_fields(io_wrapper, chunk_size=1 << 16):
+    # yields (key, value) pairs, the vertices and edges values are
+    # generators which must be consumed before the next pair
+    stream = _JsonStream(io_wrapper, chunk_size=chunk_size)
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        if key in ('vertices', 'edges'):
+            yield key, stream.items()
+        else:
+            yield key, stream.value()
+        if stream.expect(',}') == '}':
+            return
 
-    for edge in content['edges']:
-        pair = Edge(tuple(edge['pair']), value=edge['value'])
-        _logger.debug('edge reborned: %s', pair)
-        graph.edges.append(pair)
-    return graph
-    
 
 def parse_arguments():
-    parser = argparse.ArgumentParser()
+    return graph_from_arguments(argument_parser().parse_args())
+
+
+def argument_parser(**kwargs):
+    parser = argparse.ArgumentParser(**kwargs)
 
     parser.add_argument('-v', '--verbose', help='Be moderatly verbose.',
                         default=False, action='store_true')
@@ -119,16 +350,69 @@ def parse_arguments():
     parser.add_argument('-d', '--graph-directory', help='''Directory for saving
                         file graphs (default: dataset/)''', default='dataset/')
 
-    parser.add_argument('-f', '--file-graph', help='Read graph file.',
-                        type=argparse.FileType('rb'))
+    sources = parser.add_mutually_exclusive_group()
+
+    sources.add_argument('-f', '--file-graph', help='Read graph file.',
+                         type=argparse.FileType('rb'))
+
+    sources.add_argument('-i', '--import-edges', help='''Create the graph from
+                         a CSV/TSV edge list, one source,target[,weight] row
+                         per edge. Use - for stdin.''',
+                         type=argparse.FileType('r'))
+
+    parser.add_argument('--delimiter', help='''Edge list delimiter (default:
+                        tab for .tsv files, comma otherwise)''')
+
+    parser.add_argument('--oriented', help='Imported graph is oriented.',
+                        default=False, action='store_true')
+
+    parser.add_argument('--weighted', help='''Imported graph is weighted, also
+                        implied by a weight column in the header.''',
+                        default=False, action='store_true')
+
+    parser.add_argument('--name', help='Imported graph name (default: random)')
 
-    args = parser.parse_args()
+    parser.add_argument('--profile', help='''Report time and counters of each
+                        phase when exiting, as a table or JSON
+                        (default: table)''', nargs='?', const='table',
+                        choices=['table', 'json'])
 
+    parser.add_argument('--profile-memory', help='''Also trace the peak memory
+                        of each phase, slowing them down. Implies
+                        --profile.''', default=False, action='store_true')
+    return parser
+
+
+def graph_from_arguments(args):
     logger.setup(args.verbose)
 
+    if args.profile is not None or args.profile_memory:
+        profiler.start(output=args.profile or 'table',
+                       trace_memory=args.profile_memory)
+
+    with profiler.phase('load'):
+        graph = load_graph(args)
+        profiler.count('vertices', len(graph.vertices))
+        profiler.count('edges', len(graph.edges))
+    return graph
+
+
+def load_graph(args):
     if args.file_graph is not None:
         _logger.info('reading graph from file: %s', args.file_graph)
         graph = read_graph(args.file_graph)
+    elif args.import_edges is not None:
+        _logger.info('importing edges from: %s', args.import_edges.name)
+        delimiter = args.delimiter
+        if delimiter is None:
+            delimiter = '\t' if args.import_edges.name.endswith('.tsv') else ','
+        graph = create_graph_from_edges(args.import_edges,
+                                        name=args.name,
+                                        is_oriented=args.oriented,
+                                        is_weighted=args.weighted,
+                                        delimiter=delimiter)
+        _logger.info('saving graph to file at: %s', args.graph_directory)
+        dumps(graph, directory=args.graph_directory)
     else:
         graph = create_graph_from_interaction()
         _logger.info('saving graph to file at: %s', args.graph_directory)
@@ -0,0 +1,299 @@
+"""
+This module answers shortest path queries between two vertices, in the
+following:
+    - Bidirectional Dijkstra, searching from both ends until they meet
+    - A*, guided by a heuristic lower bound of the distance to the target
+
+Heuristics are built for one target, from vertice coordinates or from
+landmark distances computed once per graph (ALT). Queries only touch the
+vertices they settle, so they explore a fraction of the graph when the
+ends are close or the heuristic is tight.
+"""
+
+
+import argparse
+import heapq
+import json
+import math
+import random
+
+import logger
+import modeler
+import profiler
+from dijkstra import DijkstraItem, shortest_paths
+from repr_types import compact_adjacent_list, reverse_compact_adjacent_list
+from util import show_banner
+
+
+_logger = logger.get_logger('point_to_point')
+
+METHODS = ('bidirectional', 'astar')
+
+
+def main():
+    parser = modeler.argument_parser(description='''Shortest path between two
+                                     vertices.''')
+
+    parser.add_argument('-s', '--source', help='Source vertice.', required=True)
+
+    parser.add_argument('-t', '--target', help='Target vertice.', required=True)
+
+    parser.add_argument('-m', '--method', help='''Search method (default:
+                        bidirectional)''', choices=METHODS,
+                        default='bidirectional')
+
+    parser.add_argument('--coordinates', help='''JSON file mapping vertices to
+                        coordinates, used by A* instead of landmarks''',
+                        type=argparse.FileType('r'))
+
+    parser.add_argument('--landmarks', help='''Landmarks count of the A*
+                        heuristic (default: 8)''', type=int, default=8)
+
+    args = parser.parse_args()
+    coordinates = None
+    if args.coordinates is not None:
+        with args.coordinates as reader:
+            coordinates = json.load(reader)
+    graph = modeler.graph_from_arguments(args)
+
+    with profiler.phase('representation'):
+        adjacency = compact_adjacent_list(graph)
+        heuristic = None
+        if args.method == 'astar':
+            if coordinates is not None:
+                heuristic = euclidean_heuristic(graph, coordinates, args.target)
+            else:
+                heuristic = landmarks(graph, args.landmarks) \
+                    .heuristic(graph.index_of(args.target))
+
+    with profiler.phase('algorithm'):
+        if args.method == 'astar':
+            items = astar_search(graph, args.source, args.target,
+                                 heuristic=heuristic, adjacency=adjacency)
+        else:
+            items = bidirectional_search(graph, args.source, args.target,
+                                         adjacency=adjacency)
+
+    with profiler.phase('output'):
+        show_banner(f'Path from {args.source} to {args.target}', separator='@')
+        if not items:
+            _logger.info('target is unreachable')
+        for item in items:
+            _logger.info(item)
+
+
+def bidirectional_search(graph, source_vertice, target, adjacency=None,
+                         reverse_adjacency=None):
+    """
+    Returns the DijkstraItem of each vertice on a shortest path from the
+    source to the target, or an empty list when the target is unreachable.
+    Item paths hold the previous vertice and the last metric is the distance.
+    """
+    if adjacency is None:
+        adjacency = compact_adjacent_list(graph)
+    if reverse_adjacency is None:
+        reverse_adjacency = reverse_compact_adjacent_list(graph)
+    source_index, target_index = graph.index_of(source_vertice), \
+        graph.index_of(target)
+
+    # forward search from the source, backward one from the target
+    adjacencies = (adjacency, reverse_adjacency)
+    metrics = ({source_index: 0}, {target_index: 0})
+    parents = ({source_index: -1}, {target_index: -1})
+    settled = (set(), set())
+    queues = ([(0, source_index)], [(0, target_index)])
+    best, meeting = math.inf, -1
+    if source_index == target_index:
+        best, meeting = 0, source_index
+
+    while queues[0] and queues[1]:
+        # no path through unsettled vertices can be shorter anymore
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        metric, index = heapq.heappop(queues[side])
+        if index in settled[side]:
+            continue
+        settled[side].add(index)
+
+        side_metrics, side_parents = metrics[side], parents[side]
+        other_metrics = metrics[1 - side]
+        for neighbour_index, weight in adjacencies[side].neighbours(index):
+            alt_len = metric + weight
+            if alt_len < side_metrics.get(neighbour_index, math.inf):
+                side_metrics[neighbour_index] = alt_len
+                side_parents[neighbour_index] = index
+                heapq.heappush(queues[side], (alt_len, neighbour_index))
+            other_len = other_metrics.get(neighbour_index)
+            if other_len is not None:
+                path_len = side_metrics[neighbour_index] + other_len
+                if path_len < best:
+                    best, meeting = path_len, neighbour_index
+
+    profiler.count('vertices settled', len(settled[0]) + len(settled[1]))
+    if meeting == -1:
+        return []
+
+    indexes = _walk(parents[0], meeting)[::-1] + \
+        _walk(parents[1], meeting)[1:]
+    return _path_items(graph, indexes, adjacency)
+
+
+def astar_search(graph, source_vertice, target, heuristic=None,
+                 adjacency=None):
+    """
+    Same result as bidirectional_search, settling vertices by their metric
+    plus `heuristic(index)`, a lower bound of their distance to the target.
+    The heuristic must be consistent, never dropping by more than the edge
+    weight between neighbours, and no heuristic is plain Dijkstra.
+    """
+    if adjacency is None:
+        adjacency = compact_adjacent_list(graph)
+    if heuristic is None:
+        heuristic = _no_heuristic
+    source_index, target_index = graph.index_of(source_vertice), \
+        graph.index_of(target)
+
+    metrics = {source_index: 0}
+    parents = {source_index: -1}
+    settled = set()
+    queue = [(heuristic(source_index), source_index)]
+    found = False
+
+    while queue:
+        _, index = heapq.heappop(queue)
+        if index in settled:
+            continue
+        settled.add(index)
+        if index == target_index:
+            found = True
+            break
+
+        metric = metrics[index]
+        for neighbour_index, weight in adjacency.neighbours(index):
+            alt_len = metric + weight
+            if alt_len < metrics.get(neighbour_index, math.inf):
+                estimate = heuristic(neighbour_index)
+                if estimate == math.inf:    # can not reach the target
+                    continue
+                metrics[neighbour_index] = alt_len
+                parents[neighbour_index] = index
+                heapq.heappush(queue, (alt_len + estimate, neighbour_index))
+
+    profiler.count('vertices settled', len(settled))
+    if not found:
+        return []
+    return _path_items(graph, _walk(parents, target_index)[::-1], adjacency)
+
+
+def euclidean_heuristic(graph, coordinates, target, scale=1):
+    """
+    Straight line distance to the target, from a mapping of vertices to
+    coordinates. Admissible when every edge weights at least `scale` times
+    the distance between its ends.
+    """
+    points = [coordinates[vertice] for vertice in graph.vertices]
+    goal = coordinates[target]
+
+    def heuristic(index):
+        return scale * math.sqrt(sum((axis - goal_axis) ** 2 for axis, goal_axis
+                                     in zip(points[index], goal)))
+    return heuristic
+
+
+def landmarks(graph, count=8, seed=0):
+    """Landmarks of the graph, computed once for each graph version."""
+    return graph.representation(f'landmarks-{count}-{seed}',
+                                lambda graph: Landmarks(graph, count, seed))
+
+
+class Landmarks:
+    """
+    Shortest distances from and to a few landmark vertices. By the triangle
+    inequality they bound the distance between any two vertices from below.
+    Landmarks are picked one by one, each the farthest from the previous
+    ones.
+    """
+
+    def __init__(self, graph, count=8, seed=0):
+        adjacency = compact_adjacent_list(graph)
+        reverse_adjacency = reverse_compact_adjacent_list(graph)
+        size = len(adjacency)
+
+        self.indexes = []
+        self.distances_from = []
+        self.distances_to = []
+        if not size:
+            return
+
+        closest = [math.inf] * size
+        index = random.Random(seed).randrange(size)
+        for _ in range(min(count, size)):
+            distances_from, _ = shortest_paths(adjacency, index)
+            distances_to = distances_from
+            if reverse_adjacency is not adjacency:
+                distances_to, _ = shortest_paths(reverse_adjacency, index)
+            self.indexes.append(index)
+            self.distances_from.append(distances_from)
+            self.distances_to.append(distances_to)
+
+            for vertice_index, metric in enumerate(distances_from):
+                closest[vertice_index] = min(closest[vertice_index], metric)
+            # unreached vertices first, they are in another component
+            index = max(range(size), key=closest.__getitem__)
+            if closest[index] == 0:
+                break
+
+    def heuristic(self, target_index):
+        bounds = [(distances_from, distances_to,
+                   distances_from[target_index], distances_to[target_index])
+                  for distances_from, distances_to
+                  in zip(self.distances_from, self.distances_to)]
+
+        def heuristic(index):
+            estimate = 0
+            for distances_from, distances_to, from_target, to_target in bounds:
+                # d(L, t) <= d(L, v) + d(v, t) and d(v, L) <= d(v, t) + d(t, L)
+                from_vertice = distances_from[index]
+                to_vertice = distances_to[index]
+                if from_vertice < math.inf:
+                    estimate = max(estimate, from_target - from_vertice)
+                if to_target < math.inf:
+                    estimate = max(estimate, to_vertice - to_target)
+            return estimate
+        return heuristic
+
+
+def _no_heuristic(index):
+    return 0
+
+
+def _walk(parents, index):
+    # indexes from index up to the search root
+    indexes = [index]
+    while parents[indexes[-1]] != -1:
+        indexes.append(parents[indexes[-1]])
+    return indexes
+
+
+def _path_items(graph, indexes, adjacency):
+    vertices = graph.vertices
+    items = []
+    metric = 0
+    previous = -1
+    for index in indexes:
+        if previous != -1:
+            metric += min(weight for neighbour_index, weight
+                          in adjacency.neighbours(previous)
+                          if neighbour_index == index)
+        items.append(DijkstraItem(vertice=vertices[index],
+                                  index=index,
+                                  path=None if previous == -1
+                                  else vertices[previous],
+                                  metric=metric))
+        previous = index
+    return items
+
+
+if __name__ == '__main__':
+    main()
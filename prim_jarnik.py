@@ -1,9 +1,10 @@
 import math
 import logger
 import modeler
-from repr_types import adjacent_list, adjacent_matrix
+import profiler
+from repr_types import compact_adjacent_list
 from util import show_banner, display_table
-from dijkstra import load_vertice_items
+from data_structures import IndexedHeap
 from kruskal import spanning_tree_graph
 
 
@@ -13,45 +14,72 @@ _logger = logger.get_logger('prim_jarnik')
 def main():
     graph = spanning_tree_graph()
     assert not graph.is_oriented, '[-] Minimum spanning trees requires non-oriented graphs'
-    printer = map(_logger.info, min_spanning_tree(graph))
-    show_banner('Results from Prim-Jarnik algo')
-    list(printer)
+    with profiler.phase('representation'):
+        adjacency = compact_adjacent_list(graph)
+    with profiler.phase('algorithm'):
+        edges = list(min_spanning_tree(graph, adjacency))
+    with profiler.phase('output'):
+        printer = map(_logger.info, edges)
+        show_banner('Results from Prim-Jarnik algo')
+        list(printer)
 
 
-def find_edge(graph, pair):
+def index_edges(graph):
+    # lightest edge for each unordered pair of vertice indexes
+    edges_by_pair = {}
     for edge in graph.edges:
-        if set(edge.pair) == set(pair):
-            return edge
-    raise RuntimeError(f'Edge not found with pair [{pair}]')
-
-
-def min_spanning_tree(graph):
-    adj_matrix = adjacent_matrix(graph)
-    adj_list = adjacent_list(graph)
-    queue = sorted(graph.vertices, reverse=True)
-    _logger.debug('queue: %s', queue) 
-    all_items = load_vertice_items(graph, queue[-1])
-    
+        index_one, index_two = graph.edge_ids(edge)
+        key = (index_one, index_two) if index_one < index_two \
+            else (index_two, index_one)
+        current = edges_by_pair.get(key)
+        if current is None or edge.value < current.value:
+            edges_by_pair[key] = edge
+    return edges_by_pair
+
+
+def min_spanning_tree(graph, adjacency=None):
+    if adjacency is None:
+        adjacency = compact_adjacent_list(graph)
+    edges_by_pair = index_edges(graph)
+    debug = _logger.hot_path()
+
+    vertices_size = len(graph.vertices)
+    visited = [False] * vertices_size
+    parents = [-1] * vertices_size
+
+    # every vertice starts unreachable, so disconnected graphs yield a forest
+    queue = IndexedHeap(vertices_size)
+    for index in range(vertices_size):
+        queue.push(index, math.inf)
+    if vertices_size:
+        queue.push(graph.index_of(min(graph.vertices)), 0)
+
+    pushes = scanned = 0
     while len(queue):
-        curr_vertice = queue.pop()
-        curr_item = all_items[curr_vertice]
-        _logger.debug('vertice: %s', curr_vertice)
-        for adj_vertice in adj_list[curr_item.index]:
-            _logger.debug('adjacent_vertice: %s', adj_vertice)
-            if not adj_vertice in queue:
+        curr_index, _ = queue.pop()
+        visited[curr_index] = True
+        if debug:
+            debug('vertice: %s', graph.vertices[curr_index])
+
+        for adj_index, new_metric in adjacency.neighbours(curr_index):
+            scanned += 1
+            if visited[adj_index]:
                 continue
-            adj_item = all_items[adj_vertice]
-            new_metric = adj_matrix[curr_item.index][adj_item.index]
-            _logger.debug('new metric: %d', new_metric)
-            _logger.debug('adjacent item: %s', adj_item)
-            if new_metric < adj_item.metric:
-                adj_item.path = curr_vertice
-                adj_item.metric = new_metric
-                _logger.debug('new info: %s', all_items[adj_vertice])
-        queue.sort(key=lambda k: all_items[k].metric, reverse=True)
-        if curr_item.path is not None:
-            adj_vertice = curr_item.path
-            yield find_edge(graph, (curr_vertice, adj_vertice))
+            if new_metric < queue.keys[adj_index]:
+                parents[adj_index] = curr_index
+                queue.push(adj_index, new_metric)
+                pushes += 1
+                if debug:
+                    debug('new metric: %s', new_metric)
+
+        adj_index = parents[curr_index]
+        if adj_index != -1:
+            key = (curr_index, adj_index) if curr_index < adj_index \
+                else (adj_index, curr_index)
+            yield edges_by_pair[key]
+
+    profiler.count('heap pushes', pushes + vertices_size)
+    profiler.count('edges scanned', scanned)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+This module provides phase level profiling for the command line tools.
+
+Phases record wall time, CPU time and operation counters reported while
+they run. Peak memory is only traced when asked for, since tracing slows
+down every allocation. Everything is a no-op until `start` is called, which
+`modeler.graph_from_arguments` does for the --profile option.
+"""
+
+
+import atexit
+import contextlib
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+
+from util import display_table
+
+
+@dataclass
+class Phase:
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: int = None
+    runs: int = 0
+    counters: dict = field(default_factory=dict)
+
+
+class Profiler:
+    def __init__(self, trace_memory=False):
+        self.phases = {}
+        self.running = None
+        self.trace_memory = trace_memory
+
+    def get_phase(self, name):
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(name=name)
+        return phase
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        phase = self.get_phase(name)
+        outer, self.running = self.running, phase
+        # peak memory of this phase only, when python can reset it
+        reset_peak = getattr(tracemalloc, 'reset_peak', None)
+        if self.trace_memory and reset_peak is not None:
+            reset_peak()
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield phase
+        finally:
+            phase.wall_time += time.perf_counter() - wall_start
+            phase.cpu_time += time.process_time() - cpu_start
+            if self.trace_memory:
+                phase.peak_memory = max(phase.peak_memory or 0,
+                                        tracemalloc.get_traced_memory()[1])
+            phase.runs += 1
+            self.running = outer
+
+    def count(self, name, amount=1):
+        phase = self.running or self.get_phase('unscoped')
+        phase.counters[name] = phase.counters.get(name, 0) + amount
+
+    def display(self):
+        headers = ['WALL (s)', 'CPU (s)', 'PEAK MEMORY (KiB)', 'COUNTERS']
+        table = []
+        for phase in self.phases.values():
+            counters = ', '.join(f'{name}={value}'
+                                 for name, value in phase.counters.items())
+            peak_memory = '-'
+            if phase.peak_memory is not None:
+                peak_memory = f'{phase.peak_memory / 1024:.1f}'
+            table.append([f'{phase.wall_time:.6f}',
+                          f'{phase.cpu_time:.6f}',
+                          peak_memory,
+                          counters or '-'])
+        display_table('Profile', headers, table, lines=list(self.phases))
+
+    def dumps(self):
+        return json.dumps([asdict(phase) for phase in self.phases.values()],
+                          indent=4)
+
+
+_profiler = None
+
+
+def start(output='table', trace_memory=False):
+    global _profiler
+    _profiler = Profiler(trace_memory=trace_memory)
+    if trace_memory:
+        tracemalloc.start()
+
+    def emit():
+        if output == 'json':
+            print(_profiler.dumps())
+        else:
+            _profiler.display()
+    atexit.register(emit)
+    return _profiler
+
+
+def is_enabled():
+    return _profiler is not None
+
+
+def phase(name):
+    if _profiler is None:
+        return contextlib.nullcontext()
+    return _profiler.phase(name)
+
+
+def count(name, amount=1):
+    if _profiler is not None:
+        _profiler.count(name, amount)
@@ -1,48 +1,122 @@
+import argparse
 import logging
 import traceback
 
-from modeler import parse_arguments
+import profiler
+from modeler import argument_parser, graph_from_arguments
 from util import display_table
 from repr_types import (maybe_remove_duplicate_edges,
-    adjacent_matrix,
+    adjacent_matrix_rows,
     edge_list,
-    adjacent_list,
-    incidence_matrix,
-    structured_matrix,
+    adjacent_list_rows,
+    incidence_matrix_rows,
     is_graph)
 
 
 def main():
-    graph = parse_arguments()
+    parser = argument_parser()
 
-    adj_headers = graph.vertices
-    display_table('Adjacent matrix', adj_headers, adjacent_matrix(graph),
-                  lines=adj_headers)
+    windows = parser.add_mutually_exclusive_group()
 
-    incidence_headers = [str(edge.pair) for edge in graph.edges]
-    display_table('Incidence matrix', incidence_headers, incidence_matrix(graph),
-                  lines=adj_headers)
+    windows.add_argument('--rows', help='''Window of table lines to show, as
+                         START:STOP indexes (default: every line)''',
+                         type=window)
 
-    adj_list = adjacent_list(graph)
-    vertices_length = len(graph.vertices)
-    
-    # create a squared matrix to transpose from list, padding empty values
-    adj_sqr_list = structured_matrix(vertices_length, padding='-')
+    windows.add_argument('--page-size', help='''Lines of each page, shown
+                         with --page (default: every line)''', type=int)
 
-    for line_index, pairs in enumerate(adj_list):
-        for column_index, vertice in enumerate(pairs):
-            adj_sqr_list[column_index][line_index] = vertice
+    parser.add_argument('--page', help='''Page to show, from 1, requires
+                        --page-size (default: 1)''', type=int)
 
-    display_table('Adjacent list', adj_headers, adj_sqr_list)
+    parser.add_argument('--columns', help='''Window of table columns to show,
+                        as START:STOP indexes (default: every column)''',
+                        type=window)
 
-    edge_list_headers = ['VERTICE', 'ADJACENT VERTICE']
+    args = parser.parse_args()
+    if args.page is not None and args.page_size is None:
+        parser.error('--page requires --page-size')
+    if args.page is not None and args.page < 1:
+        parser.error('--page starts from 1')
+    graph = graph_from_arguments(args)
 
-    if graph.is_weighted:
-        edge_list_headers.append('WEIGHT')
-    else:
-        edge_list_headers.append('CONNECTIONS')
+    rows = args.rows
+    if args.page_size is not None:
+        start = ((args.page or 1) - 1) * args.page_size
+        rows = slice(start, start + args.page_size)
 
-    display_table('Edge lists', edge_list_headers, edge_list(graph), end="")
+    with profiler.phase('representation'):
+        edges = edge_list(graph)
+
+    with profiler.phase('output'):
+        vertices = graph.vertices
+        lines, line_summary = clip(rows, len(vertices), 'lines')
+        columns, column_summary = clip(args.columns, len(vertices), 'columns')
+        summary = join_summaries(line_summary, column_summary)
+
+        adj_headers = [vertices[index] for index in columns]
+        adj_lines = [vertices[index] for index in lines]
+        display_table('Adjacent matrix', adj_headers,
+                      adjacent_matrix_rows(graph, lines, columns),
+                      lines=adj_lines, summary=summary)
+
+        edge_columns, edge_summary = clip(args.columns, len(graph.edges),
+                                          'columns')
+        incidence_headers = [str(graph.edges.pair(index))
+                             for index in edge_columns]
+        display_table('Incidence matrix', incidence_headers,
+                      incidence_matrix_rows(graph, lines, edge_columns),
+                      lines=adj_lines,
+                      summary=join_summaries(line_summary, edge_summary))
+
+        display_table('Adjacent list', adj_headers,
+                      adjacent_list_rows(graph, lines, columns),
+                      summary=summary)
+
+        edge_list_headers = ['VERTICE', 'ADJACENT VERTICE']
+
+        if graph.is_weighted:
+            edge_list_headers.append('WEIGHT')
+        else:
+            edge_list_headers.append('CONNECTIONS')
+
+        edge_lines, edge_list_summary = clip(rows, len(edges), 'lines')
+        display_table('Edge lists', edge_list_headers,
+                      (edges[index] for index in edge_lines), end="",
+                      summary=join_summaries(edge_list_summary))
+
+
+def window(text):
+    start, separator, stop = text.partition(':')
+    try:
+        start = int(start) if start else None
+        stop = int(stop) if stop else None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expecting START:STOP, found [{text}]')
+    if not separator:   # a single index
+        stop = None if start is None else start + 1
+    return slice(start, stop)
+
+
+def clip(window, size, name):
+    """
+    Range of indexes of the window over size items, and a summary telling
+    what was left out, None when nothing was.
+    """
+    if window is None:
+        return range(size), None
+    indexes = range(*window.indices(size))
+    if len(indexes) == size:
+        return indexes, None
+    if not indexes:
+        return indexes, f'no {name} of {size}'
+    return indexes, f'{name} {indexes[0]} to {indexes[-1]} of {size}'
+
+
+def join_summaries(*summaries):
+    summaries = [summary for summary in summaries if summary is not None]
+    if not summaries:
+        return None
+    return 'showing ' + ', '.join(summaries)
 
 
 if __name__ == '__main__':
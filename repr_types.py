@@ -4,54 +4,83 @@ This module provides functions to 4 different graph representations, in the foll
     - Incidence matrix
     - Edge list
     - Adjacent list
+
+The compact adjacent list and the sparse adjacent matrix are the forms used
+by the algorithms, dense matrices are only meant for display.
+
+Representations are memoized on the graph until it changes, so their values
+must be treated as read-only.
 """
 
 
-from data_structures import Graph, Edge
+from array import array
+import functools
+
+from data_structures import Graph, Edge, CompactAdjacency
+
 
+def memoized(builder):
+    @functools.wraps(builder)
+    def wrapper(graph: Graph):
+        return graph.representation(builder.__name__, builder)
+    return wrapper
 
+
+@memoized
 def edge_list(graph: Graph):
     if graph.is_weighted: # weighted graphs is simpler
         return [[*edge.pair, edge.value] for edge in graph.edges]
 
     edge_list = list()
+    # rows by ordered pair of vertice indexes
+    rows = {}
     for edge in graph.edges:
-        # start connection count number
-        value = 1
-
-        # try to match the edge already mapped on list
-        index = _get_list_index(edge, edge_list)
+        key = graph.edge_ids(edge)
+        row = rows.get(key)
 
-        if index == -1: # no edges found, create it
-            edge_list.append([*edge.pair, value])
-        else:   # sum the present connections value and save
-            value += edge_list[index][2]
-            edge_list[index][2] = value
+        if row is None: # no edges found, create it
+            row = rows[key] = [*edge.pair, 0]
+            edge_list.append(row)
+        # sum the present connections value
+        row[2] += 1
 
     return edge_list
 
 
+@memoized
 def adjacent_matrix(graph: Graph):
     # create the squared matrix filled with an insignificant number
     matrix = structured_matrix(len(graph.vertices))
 
+    for line_index, columns in enumerate(sparse_adjacent_matrix(graph)):
+        line = matrix[line_index]
+        for column_index, value in columns.items():
+            line[column_index] = value
+    return matrix
+
+
+@memoized
+def sparse_adjacent_matrix(graph: Graph):
+    # one {column index: value} mapping per line, missing cells are zero
+    matrix = [{} for _ in range(len(graph.vertices))]
+
     for edge in graph.edges:
-        # get vertices and indexes
-        line_vertice, line_index, \
-            column_vertice, column_index = _retrieve_edge_info(edge, graph)
+        line_index, column_index = graph.edge_ids(edge)
 
         if graph.is_weighted:   # change value if highest
-            current_weight = matrix[line_index][column_index]
+            current_weight = matrix[line_index].get(column_index, 0)
             if edge.value > current_weight:
                 matrix[line_index][column_index] = edge.value
                 if not graph.is_oriented:
                     matrix[column_index][line_index] = edge.value
         else:   # appends a new path, this make works for multi edges too
-            matrix[line_index][column_index] += 1
-            matrix[column_index][line_index] += 1
+            line, column = matrix[line_index], matrix[column_index]
+            line[column_index] = line.get(column_index, 0) + 1
+            column[line_index] = column.get(line_index, 0) + 1
     return matrix
 
 
+@memoized
 def adjacent_list(graph: Graph):
     # create a list with the vertices length
     adjacent_list = structured_matrix(len(graph.vertices), column_size=0)
@@ -71,6 +100,112 @@ def adjacent_list(graph: Graph):
     return adjacent_list
 
 
+@memoized
+def compact_adjacent_list(graph: Graph):
+    edges = graph.edges
+    sources, targets = edges.index_columns(graph.vertices.ids)
+    if graph.is_weighted:
+        weights = edges.weight_column()
+    else:   # non-weighted graphs costs one per edge
+        weights = array('q', [1]) * len(sources)
+
+    builder = CompactAdjacencyBuilder.from_columns(sources, targets, weights)
+    return builder.build(len(graph.vertices), graph.is_oriented)
+
+
+@memoized
+def reverse_compact_adjacent_list(graph: Graph):
+    # incoming neighbours of each vertice, the same as outgoing ones when
+    # the graph is not oriented
+    if not graph.is_oriented:
+        return compact_adjacent_list(graph)
+    edges = graph.edges
+    sources, targets = edges.index_columns(graph.vertices.ids)
+    if graph.is_weighted:
+        weights = edges.weight_column()
+    else:
+        weights = array('q', [1]) * len(sources)
+
+    builder = CompactAdjacencyBuilder.from_columns(targets, sources, weights)
+    return builder.build(len(graph.vertices), graph.is_oriented)
+
+
+class CompactAdjacencyBuilder:
+    """
+    Collects edges as flat (source, target, weight) index columns, then lays
+    them out as a CompactAdjacency. Weights are an int or float array, or a
+    list once both kinds were added, so integers stay exact.
+    """
+
+    def __init__(self):
+        self.sources = array('q')
+        self.targets = array('q')
+        self.weights = array('q')
+
+    @classmethod
+    def from_columns(cls, sources, targets, weights):
+        builder = cls()
+        builder.sources = array('q', sources)
+        builder.targets = array('q', targets)
+        if isinstance(weights, list):
+            builder.weights = list(weights)
+        else:
+            typecode = getattr(weights, 'typecode', None) or weights.format
+            builder.weights = array(typecode, weights)
+        return builder
+
+    def add(self, source, target, weight):
+        weights = self.weights
+        if isinstance(weights, array) and \
+                isinstance(weight, int) != (weights.typecode == 'q'):
+            if weights:
+                self.weights = list(weights)
+            else:   # nothing to keep exact yet
+                self.weights = array('q' if isinstance(weight, int) else 'd')
+        self.sources.append(source)
+        self.targets.append(target)
+        self.weights.append(weight)
+
+    def build(self, vertices_size, is_oriented):
+        sources, targets, weights = self.sources, self.targets, self.weights
+        # same semantics of adjacent_list, loops are not saved twice
+        mirrored = not is_oriented
+
+        # count the degrees and turn them into row offsets
+        offsets = array('q', bytes(8 * (vertices_size + 1)))
+        for source, target in zip(sources, targets):
+            offsets[source + 1] += 1
+            if mirrored and source != target:
+                offsets[target + 1] += 1
+        for index in range(vertices_size):
+            offsets[index + 1] += offsets[index]
+
+        # stable placement keeps the edges order inside each row
+        position = array('q', offsets)
+        size = offsets[vertices_size]
+        row_targets = array('q', bytes(8 * size))
+        if isinstance(weights, list):
+            row_weights = [0] * size
+        else:
+            row_weights = array(weights.typecode,
+                                bytes(weights.itemsize * size))
+        for source, target, weight in zip(sources, targets, weights):
+            slot = position[source]
+            row_targets[slot] = target
+            row_weights[slot] = weight
+            position[source] = slot + 1
+            if mirrored and source != target:
+                slot = position[target]
+                row_targets[slot] = source
+                row_weights[slot] = weight
+                position[target] = slot + 1
+
+        return CompactAdjacency(offsets=offsets,
+                                targets=row_targets,
+                                weights=row_weights)
+
+
+@memoized
 def incidence_matrix(graph: Graph):
     matrix = structured_matrix(len(graph.vertices), column_size=len(graph.edges))
 
@@ -96,6 +231,14 @@ def incidence_matrix(graph: Graph):
     return matrix
 
 
+@memoized
+def degree_vector(graph: Graph):
+    # neighbours count of each vertice, following adjacent_list semantics
+    offsets = compact_adjacent_list(graph).offsets
+    return [offsets[index + 1] - offsets[index]
+            for index in range(len(graph.vertices))]
+
+
 def is_graph(graph: Graph):
     if not len(graph.edges):
         return False
@@ -103,10 +246,8 @@ def is_graph(graph: Graph):
     if graph.is_oriented:
         return True
 
-    adj_list = adjacent_list(graph)
-    degrees = (len(vertices) for vertices in adj_list)
     odds = 0
-    for d in degrees:
+    for d in degree_vector(graph):
         if d % 2 != 0:
             odds += 1
     return odds % 2 == 0
@@ -117,14 +258,79 @@ def maybe_remove_duplicate_edges(graph: Graph):
         return graph
 
     new_edges = []
+    seen_pairs = set()
     for edge in graph.edges:
-        if not _has_adjacent_edge(edge, new_edges):
+        key = _unordered_key(*graph.edge_ids(edge))
+        if key not in seen_pairs:
+            seen_pairs.add(key)
             new_edges.append(edge)
 
     graph.edges = new_edges
     return graph
 
 
+def adjacent_matrix_rows(graph: Graph, lines=None, columns=None):
+    """
+    Yields the adjacent matrix rows without building the whole matrix,
+    restricted to the `lines` and `columns` ranges of vertice indexes.
+    """
+    vertices_size = len(graph.vertices)
+    lines = range(vertices_size) if lines is None else lines
+    columns = range(vertices_size) if columns is None else columns
+
+    sparse_matrix = sparse_adjacent_matrix(graph)
+    for line_index in lines:
+        cells = sparse_matrix[line_index]
+        yield [cells.get(column_index, 0) for column_index in columns]
+
+
+def incidence_matrix_rows(graph: Graph, lines=None, columns=None):
+    """
+    Yields the incidence matrix rows without building the whole matrix,
+    restricted to the `lines` range of vertice indexes and the `columns`
+    range of edge indexes.
+    """
+    lines = range(len(graph.vertices)) if lines is None else lines
+    columns = range(len(graph.edges)) if columns is None else columns
+
+    edges, ids = graph.edges, graph.vertices.ids
+    # (exit index, enter index, value) of each edge column
+    incidences = []
+    for index in columns:
+        vertice_one, vertice_two = edges.pair(index)
+        value = 1
+        if graph.is_oriented and graph.is_weighted:
+            value = edges.value(index)
+        incidences.append((ids[vertice_one], ids[vertice_two], value))
+
+    for line_index in lines:
+        if graph.is_oriented:   # loops only exits
+            yield [value if line_index == index_one
+                   else -value if line_index == index_two else 0
+                   for index_one, index_two, value in incidences]
+        else:
+            yield [(line_index == index_one) + (line_index == index_two)
+                   for index_one, index_two, _ in incidences]
+
+
+def adjacent_list_rows(graph: Graph, lines=None, columns=None, padding='-'):
+    """
+    Yields the adjacent list transposed, one row by neighbour position and
+    one column by vertice, padding the missing neighbours. Rows are
+    restricted to the `lines` range of positions and the `columns` range of
+    vertice indexes.
+    """
+    vertices_size = len(graph.vertices)
+    lines = range(vertices_size) if lines is None else lines
+    columns = range(vertices_size) if columns is None else columns
+
+    neighbours = adjacent_list(graph)
+    for position in lines:
+        yield [neighbours[column_index][position]
+               if position < len(neighbours[column_index]) else padding
+               for column_index in columns]
+
+
 def structured_matrix(line_size, column_size=None, padding=0):
     line_sequence = range(line_size)
 
@@ -135,30 +341,15 @@ def structured_matrix(line_size, column_size=None, padding=0):
     return [[padding for _ in column_sequence] for i in line_sequence]
 
 
-def _has_adjacent_edge(target: Edge, edge_list):
-    pair = target.pair[:2]
-    for index, edge in enumerate(edge_list):
-        if edge.pair[:2] == pair:
-            return True
-
-        # reverse the duplicate edge order
-        reversed_edge = edge.clone()
-        reversed_edge.pair = edge.pair[-1::-1]
-        if reversed_edge.pair[:2] == pair:
-            return True
-    return False
-
-
-def _get_list_index(target: Edge, pair_list, default=-1):
-    pair = target.pair[:2]
-    for index, edge in enumerate(pair_list):
-        if edge[:2] == pair:
-            return index
-    return default
+def _unordered_key(index_one, index_two):
+    # same key for both directions of a pair
+    if index_one <= index_two:
+        return index_one, index_two
+    return index_two, index_one
 
 
 def _retrieve_edge_info(edge: Edge, graph: Graph):
     primary = edge.pair[0]
     secondary = edge.pair[1]
-    vertices = graph.vertices
-    return primary, vertices.index(primary), secondary, vertices.index(secondary)
+    ids = graph.vertices.ids
+    return primary, ids[primary], secondary, ids[secondary]
@@ -0,0 +1,284 @@
+"""
+This module serves graph queries from a long running process, so graphs are
+read and their representations built only once.
+
+Requests and responses are JSON objects, one per line, over a Unix socket
+or TCP. Each request names a `query` among:
+    - graphs: names and sizes of the loaded graphs
+    - load: reads the graph `file`, replacing a graph of the same name
+    - dfs, kruskal, prim: runs the algorithm over the `graph`
+    - dijkstra: the whole table from `source`, or the path to `target`
+    - add_edge: appends the edge `source`, `target`, `value` to the `graph`
+
+Results are cached in a bounded LRU keyed by graph version and request, so
+a changed graph never answers from stale entries. Queries and loads run in
+a worker thread, one at a time, so the loop keeps answering cached results
+meanwhile; graphs are only changed on the loop, once the queries running
+over them are done.
+"""
+
+
+import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+import json
+import os
+import signal
+import socket
+
+import batch
+import logger
+import modeler
+from point_to_point import bidirectional_search
+from repr_types import compact_adjacent_list
+
+
+_logger = logger.get_logger('server')
+
+ALGORITHMS = ('dfs', 'dijkstra', 'kruskal', 'prim')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='''Serve graph queries over a
+                                     Unix socket or TCP.''')
+
+    parser.add_argument('-v', '--verbose', help='Be moderatly verbose.',
+                        default=False, action='store_true')
+
+    addresses = parser.add_mutually_exclusive_group()
+
+    addresses.add_argument('--socket', help='''Unix socket path (default:
+                           graph-tools.sock)''', default='graph-tools.sock')
+
+    addresses.add_argument('--port', help='Serve over TCP instead.', type=int)
+
+    parser.add_argument('--host', help='TCP host (default: 127.0.0.1)',
+                        default='127.0.0.1')
+
+    parser.add_argument('--cache-size', help='''Results kept in cache
+                        (default: 256)''', type=int, default=256)
+
+    parser.add_argument('-r', '--recursive', help='Look into subdirectories.',
+                        default=False, action='store_true')
+
+    parser.add_argument('paths', nargs='*', default=['dataset/'],
+                        help='Graph files or directories (default: dataset/)')
+
+    args = parser.parse_args()
+
+    logger.setup(args.verbose)
+
+    server = GraphServer(cache_size=args.cache_size)
+    for path in args.paths:
+        if os.path.isdir(path):
+            for _, filename in batch.discover_graphs([path],
+                                                     recursive=args.recursive):
+                server.load(filename)
+        else:
+            server.load(path)
+
+    address = args.socket if args.port is None else (args.host, args.port)
+    asyncio.run(server.serve(address))
+
+
+class ResultCache:
+    """Bounded mapping dropping the least recently used entries first."""
+
+    def __init__(self, size=256):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+class GraphServer:
+    def __init__(self, cache_size=256):
+        # (load number, graph) by name, load numbers are never reused so a
+        # reloaded graph never answers from entries of the one it replaced
+        self.graphs = {}
+        self.loads = 0
+        self.cache = ResultCache(cache_size)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # futures of the queries running in the worker, by load number
+        self.running = {}
+
+    def load(self, filename):
+        return self.store(self.read(filename))
+
+    def read(self, filename):
+        with open(filename, 'rb') as reader:
+            graph = modeler.read_graph(reader)
+        # built once here, then reused by every query until the graph changes
+        compact_adjacent_list(graph)
+        _logger.info('loaded graph %s from: %s', graph.name, filename)
+        return graph
+
+    def store(self, graph):
+        self.loads += 1
+        self.graphs[graph.name] = (self.loads, graph)
+        return graph
+
+    def graph(self, name):
+        """Returns the load number and the graph loaded under the name."""
+        loaded = self.graphs.get(name)
+        if loaded is None:
+            raise KeyError(f'Unknown graph [{name}].')
+        return loaded
+
+    def answer(self, request):
+        query = request.get('query')
+
+        if query == 'graphs':
+            return [{'name': name,
+                     'vertices': len(graph.vertices),
+                     'edges': len(graph.edges)}
+                    for name, (_, graph) in self.graphs.items()]
+
+        if query == 'load':
+            graph = self.load(request['file'])
+            return {'name': graph.name}
+
+        if query == 'add_edge':
+            _, graph = self.graph(request['graph'])
+            graph.add_edge(request['source'], request['target'],
+                           request.get('value'))
+            return {'edges': len(graph.edges)}
+
+        if query in ALGORITHMS:
+            load, graph = self.graph(request['graph'])
+            key = self.cache_key(load, graph, request)
+            result = self.cache.get(key)
+            if result is None:
+                result = self.solve(graph, request)
+                self.cache.put(key, result)
+            return result
+
+        raise ValueError(f'Unknown query [{query}].')
+
+    async def respond(self, request):
+        """Same as answer, running queries and loads in the worker."""
+        query = request.get('query')
+        loop = asyncio.get_running_loop()
+
+        if query == 'load':
+            graph = await loop.run_in_executor(self.executor, self.read,
+                                               request['file'])
+            # a replaced graph is left as it is to the queries running on it
+            self.store(graph)
+            return {'name': graph.name}
+
+        if query == 'add_edge':
+            load, _ = self.graph(request['graph'])
+            while self.running.get(load):
+                await asyncio.wait(self.running[load])
+
+        if query in ALGORITHMS:
+            load, graph = self.graph(request['graph'])
+            key = self.cache_key(load, graph, request)
+            result = self.cache.get(key)
+            if result is None:
+                future = loop.run_in_executor(self.executor, self.solve, graph,
+                                              request)
+                running = self.running.setdefault(load, set())
+                running.add(future)
+                try:
+                    result = await future
+                finally:
+                    running.discard(future)
+                    if not running:
+                        del self.running[load]
+                self.cache.put(key, result)
+            return result
+
+        return self.answer(request)
+
+    def cache_key(self, load, graph, request):
+        return (graph.name, load, graph.version,
+                json.dumps(request, sort_keys=True))
+
+    def solve(self, graph, request):
+        query = request['query']
+        if query == 'dijkstra' and request.get('target') is not None:
+            items = bidirectional_search(graph, request['source'],
+                                         request['target'])
+            return {
+                'source': request['source'],
+                'target': request['target'],
+                'distance': items[-1].metric if items else None,
+                'items': [asdict(item) for item in items],
+            }
+        return batch.solve(graph, query, source=request.get('source'))
+
+    async def handle(self, reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                response = {'ok': True,
+                            'result': await self.respond(json.loads(line))}
+            except Exception as error:
+                response = {'ok': False,
+                            'error': f'{type(error).__name__}: {error}'}
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            await writer.drain()
+        writer.close()
+
+    async def serve(self, address):
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.remove(address)
+            server = await asyncio.start_unix_server(self.handle, path=address)
+        else:
+            host, port = address
+            server = await asyncio.start_server(self.handle, host, port)
+        _logger.info('serving %d graphs on: %s', len(self.graphs), address)
+
+        stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, stopped.set)
+        try:
+            async with server:
+                await stopped.wait()
+        finally:
+            if isinstance(address, str) and os.path.exists(address):
+                os.remove(address)
+            self.executor.shutdown(cancel_futures=True)
+            _logger.info('cache hits: %d, misses: %d', self.cache.hits,
+                         self.cache.misses)
+
+
+def query(address, **request):
+    """Sends one request to a running server and returns its result."""
+    if isinstance(address, str):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    with connection:
+        connection.connect(address)
+        connection.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with connection.makefile('rb') as reader:
+            response = json.loads(reader.readline())
+    if not response['ok']:
+        raise RuntimeError(response['error'])
+    return response['result']
+
+
+if __name__ == '__main__':
+    main()
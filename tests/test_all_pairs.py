@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+import all_pairs
+import generators
+from dijkstra import shortest_paths
+from repr_types import compact_adjacent_list
+
+
+class AllPairsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.filename = os.path.join(self.directory.name, 'paths.matrix')
+
+    def assert_matches_dijkstra(self, graph, sources=None):
+        all_pairs.all_pairs(graph, self.filename, sources=sources, workers=2)
+        adjacency = compact_adjacent_list(graph)
+        if sources is None:
+            sources = graph.vertices
+
+        with all_pairs.open_matrix(self.filename) as matrix:
+            self.assertEqual(list(matrix.sources),
+                             [graph.index_of(source) for source in sources])
+            for row, source in enumerate(sources):
+                metrics, parents = shortest_paths(adjacency,
+                                                  graph.index_of(source))
+                distances, predecessors = matrix.row(row)
+                self.assertEqual(list(distances), metrics)
+                self.assertEqual(list(predecessors), parents)
+
+                for target_index, metric in enumerate(metrics):
+                    path = matrix.path(row, target_index)
+                    if metric == float('inf'):
+                        self.assertEqual(path, [])
+                    else:
+                        self.assertEqual((path[0], path[-1]),
+                                         (graph.index_of(source), target_index))
+
+    def test_every_source(self):
+        for seed, is_oriented in ((1, False), (2, True)):
+            graph = generators.random_graph(40, 70, seed=seed,
+                                            is_oriented=is_oriented)
+            self.assert_matches_dijkstra(graph)
+
+    def test_some_sources(self):
+        graph = generators.random_graph(30, 25, seed=3, is_oriented=True)
+        self.assert_matches_dijkstra(graph, sources=['7', '0', '29'])
+
+    def test_mixed_weights(self):
+        graph = generators.random_graph(25, 50, seed=4)
+        graph.edges.set_value(0, 0.5)
+        self.assert_matches_dijkstra(graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
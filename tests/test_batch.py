@@ -0,0 +1,27 @@
+import os
+import tempfile
+import unittest
+
+import batch
+
+
+class DiscoverGraphsTest(unittest.TestCase):
+    def test_skips_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results')
+            os.makedirs(os.path.join(directory, 'sub'))
+            os.makedirs(output)
+            for filename in ('a.json', 'a.json.dfs.json', batch.SUMMARY,
+                             'b.graph', 'notes.txt', 'sub/c.json',
+                             'results/d.json'):
+                open(os.path.join(directory, filename), 'w').close()
+
+            found = [os.path.relpath(filename, directory) for _, filename
+                     in batch.discover_graphs([directory], recursive=True,
+                                              exclude=[output])]
+            self.assertEqual(found, ['a.json', 'b.graph',
+                                     os.path.join('sub', 'c.json')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import glob
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import binary_graph
+import convert
+import dijkstra
+import modeler
+from data_structures import Graph
+from repr_types import compact_adjacent_list
+
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'dataset')
+
+
+def mixed_graph():
+    graph = Graph(name='mixed', is_oriented=True, is_weighted=True)
+    graph.vertices.extend('abcde')
+    for source, target, value in (('a', 'b', 1), ('b', 'c', 2.5),
+                                  ('a', 'd', 3), ('d', 'e', None)):
+        graph.edges.add(source, target, value)
+    return graph
+
+
+def binary_copy(graph):
+    writer = io.BytesIO()
+    binary_graph.write(graph, writer)
+    return io.BytesIO(writer.getvalue())
+
+
+class MixedWeightsTest(unittest.TestCase):
+    def test_round_trip_keeps_types(self):
+        graph = mixed_graph()
+        copy = binary_graph.read_graph(binary_copy(graph))
+        self.assertEqual(copy.edges.rows(), graph.edges.rows())
+        self.assertEqual([type(row[2]) for row in copy.edges.rows()],
+                         [int, float, int, type(None)])
+
+    def test_integer_paths_stay_integers(self):
+        graph = mixed_graph()
+        _, binary_adjacency = binary_graph.read_compact_graph(
+            binary_copy(graph))
+        text = json.dumps(modeler.graph_dict(graph)).encode('utf-8')
+        _, json_adjacency = modeler.read_compact_graph(io.BytesIO(text))
+        for adjacency in (compact_adjacent_list(graph), binary_adjacency,
+                          json_adjacency):
+            metrics = {item.vertice: item.metric for item
+                       in dijkstra.search(graph, 'a', adjacency=adjacency)}
+            self.assertEqual(metrics, {'a': 0, 'b': 1, 'c': 3.5, 'd': 3,
+                                       'e': 3})
+            self.assertIs(type(metrics['d']), int)
+            self.assertIs(type(metrics['c']), float)
+
+    def test_reads_version_1(self):
+        graph = mixed_graph()
+        data = bytearray(binary_copy(graph).getvalue())
+        # version 1 files end with the weights column
+        data[4:6] = (1).to_bytes(2, 'little')
+        data = data[:-8]
+        copy = binary_graph.read_graph(io.BytesIO(bytes(data)))
+        self.assertEqual([row[2] for row in copy.edges.rows()],
+                         [1.0, 2.5, 3.0, 0.0])
+
+
+class ConvertTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def convert(self, filename):
+        output = convert.convert_graph(filename, directory=self.directory.name)
+        self.assertTrue(output.endswith(binary_graph.EXTENSION))
+        return output
+
+    def assert_same_graph(self, graph, copy):
+        self.assertEqual((copy.name, copy.is_oriented, copy.is_weighted),
+                         (graph.name, graph.is_oriented, graph.is_weighted))
+        self.assertEqual(list(copy.vertices), list(graph.vertices))
+        self.assertEqual(copy.edges.rows(), graph.edges.rows())
+        self.assertEqual([type(row[2]) for row in copy.edges.rows()],
+                         [type(row[2]) for row in graph.edges.rows()])
+
+    def assert_same_adjacency(self, adjacency, expected):
+        for column in ('offsets', 'targets', 'weights'):
+            self.assertEqual(list(getattr(adjacency, column)),
+                             list(getattr(expected, column)))
+
+    def test_dataset_round_trip(self):
+        filenames = sorted(glob.glob(os.path.join(DATASET, '*.json')))
+        self.assertTrue(filenames)
+        for filename in filenames:
+            with open(filename, 'rb') as reader:
+                graph = modeler.read_graph(reader)
+            output = self.convert(filename)
+
+            # binary files are told apart by the readers themselves
+            with open(output, 'rb') as reader:
+                self.assert_same_graph(graph, modeler.read_graph(reader))
+            with open(output, 'rb') as reader:
+                compact_graph, adjacency = modeler.read_compact_graph(reader)
+            self.assertEqual(list(compact_graph.vertices),
+                             list(graph.vertices))
+            self.assert_same_adjacency(adjacency, compact_adjacent_list(graph))
+
+            with open(filename, 'rb') as reader:
+                _, json_adjacency = modeler.read_compact_graph(reader)
+            self.assert_same_adjacency(json_adjacency, adjacency)
+
+    def test_mixed_weights_round_trip(self):
+        graph = mixed_graph()
+        modeler.dumps(graph, directory=self.directory.name)
+        output = self.convert(os.path.join(self.directory.name,
+                                           'mixed.json'))
+        with open(output, 'rb') as reader:
+            self.assert_same_graph(graph, modeler.read_graph(reader))
+
+    def test_rejects_other_files(self):
+        data = bytearray(binary_copy(mixed_graph()).getvalue())
+        data[4:6] = (binary_graph.VERSION + 1).to_bytes(2, 'little')
+        with self.assertRaises(ValueError):
+            binary_graph.read_graph(io.BytesIO(bytes(data)))
+
+
+if __name__ == '__main__':
+    unittest.main()
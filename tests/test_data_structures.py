@@ -0,0 +1,158 @@
+import copy
+import pickle
+import random
+import unittest
+
+import generators
+import kruskal
+from data_structures import DisjointSet, Edge, EdgeTable, IndexedHeap
+
+
+class VerticesTest(unittest.TestCase):
+    def test_graph_pickles(self):
+        graph = generators.random_graph(10, 20, seed=1)
+        copy = pickle.loads(pickle.dumps(graph))
+
+        self.assertEqual(copy.vertices, graph.vertices)
+        self.assertEqual(copy.vertices.ids, graph.vertices.ids)
+        self.assertEqual(copy.edges, graph.edges)
+        copy.vertices.append('new')
+        self.assertEqual(copy.index_of('new'), 10)
+
+
+class EdgeViewTest(unittest.TestCase):
+    def test_pickles_as_edge(self):
+        graph = generators.random_graph(10, 20)
+        view = graph.edges[3]
+        for edge in (pickle.loads(pickle.dumps(view)), copy.copy(view)):
+            self.assertIs(type(edge), Edge)
+            self.assertEqual(edge, view)
+
+    def test_spanning_tree_pickles(self):
+        graph = generators.random_graph(30, 60, seed=4)
+        edges = list(kruskal.min_spanning_tree(graph))
+        self.assertEqual(pickle.loads(pickle.dumps(edges)), edges)
+
+
+class GraphTest(unittest.TestCase):
+    def test_appended_since(self):
+        graph = generators.random_graph(10, 20)
+        checkpoint = graph.checkpoint()
+        graph.add_edge('0', 'new', 3)
+        self.assertEqual(graph.appended_since(checkpoint),
+                         (range(10, 11), range(20, 21)))
+
+        for change in (lambda: graph.vertices.insert(0, 'first'),
+                       lambda: graph.vertices.truncate(5),
+                       lambda: graph.edges.set_value(0, 1),
+                       lambda: setattr(graph, 'edges', graph.edges.copy())):
+            checkpoint = graph.checkpoint()
+            change()
+            self.assertIsNone(graph.appended_since(checkpoint))
+
+
+class EdgeTableTest(unittest.TestCase):
+    def test_mixed_weights_keep_types(self):
+        edges = EdgeTable()
+        edges.add('a', 'b', 3)
+        edges.add('b', 'c', None)
+        edges.add('c', 'd', 2.5)
+        edges.add('d', 'e', 4)
+        edges.set_value(0, 1 << 40)
+
+        values = [edges.value(index) for index in range(len(edges))]
+        self.assertEqual(values, [1 << 40, None, 2.5, 4])
+        self.assertEqual([type(value) for value in values],
+                         [int, type(None), float, int])
+        self.assertEqual(edges.copy().rows(), edges.rows())
+
+    def test_appended_since(self):
+        edges = EdgeTable()
+        edges.add('a', 'b', 1)
+        checkpoint = edges.checkpoint()
+        self.assertEqual(edges.appended_since(checkpoint), range(1, 1))
+        edges.add('b', 'c', 2)
+        edges.add('c', 'd', 3)
+        self.assertEqual(edges.appended_since(checkpoint), range(1, 3))
+
+        for change in (lambda: edges.set_value(0, 5),
+                       lambda: edges.truncate(1),
+                       edges.clear):
+            checkpoint = edges.checkpoint()
+            change()
+            # appending back to the same length does not hide the change
+            while len(edges) < checkpoint[1]:
+                edges.add('x', 'y', 0)
+            self.assertIsNone(edges.appended_since(checkpoint))
+
+    def test_weights_out_of_range(self):
+        edges = EdgeTable()
+        edges.add('a', 'b', (1 << 63) - 1)
+        with self.assertRaises(ValueError):
+            edges.add('b', 'c', 1 << 63)
+        # a float column can not hold it exactly either
+        with self.assertRaises(ValueError):
+            edges.add('b', 'c', 0.5)
+        self.assertEqual(edges.rows(), [('a', 'b', (1 << 63) - 1)])
+
+        edges.set_value(0, 1)
+        edges.add('b', 'c', 0.5)
+        with self.assertRaises(ValueError):
+            edges.set_value(0, (1 << 53) + 1)
+        self.assertEqual(edges.rows(), [('a', 'b', 1), ('b', 'c', 0.5)])
+
+
+class DisjointSetTest(unittest.TestCase):
+    def test_matches_naive_components(self):
+        rand = random.Random(0)
+        size = 60
+        components = DisjointSet(size)
+        labels = list(range(size))
+
+        for _ in range(200):
+            item1, item2 = rand.randrange(size), rand.randrange(size)
+            joined = labels[item1] != labels[item2]
+            self.assertEqual(components.union(item1, item2), joined)
+            if joined:
+                old, new = labels[item2], labels[item1]
+                labels = [new if label == old else label for label in labels]
+
+            for item in range(size):
+                for other in range(0, size, 7):
+                    self.assertEqual(
+                        components.find(item) == components.find(other),
+                        labels[item] == labels[other])
+
+
+class IndexedHeapTest(unittest.TestCase):
+    def test_matches_sorted_reference(self):
+        rand = random.Random(1)
+        size = 50
+        heap = IndexedHeap(size)
+        reference = {}
+
+        for _ in range(2000):
+            item = rand.randrange(size)
+            if rand.random() < 0.6:
+                key = rand.randint(0, 100)
+                if item in reference and key > reference[item]:
+                    with self.assertRaises(ValueError):
+                        heap.push(item, key)
+                    continue
+                heap.push(item, key)
+                reference[item] = key
+            elif reference:
+                expected = min(reference.items(), key=lambda e: (e[1], e[0]))
+                self.assertEqual(heap.pop(), expected)
+                del reference[expected[0]]
+
+            self.assertEqual(len(heap), len(reference))
+            self.assertEqual(item in heap, item in reference)
+
+        drained = [heap.pop() for _ in range(len(heap))]
+        self.assertEqual(drained, sorted(reference.items(),
+                                         key=lambda e: (e[1], e[0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+import dense
+import generators
+from dijkstra import shortest_paths
+from repr_types import compact_adjacent_list
+
+
+@unittest.skipIf(dense.numpy is None, 'requires numpy')
+class FloydWarshallTest(unittest.TestCase):
+    def assert_matches_dijkstra(self, graph, **kwargs):
+        adjacency = compact_adjacent_list(graph)
+        distances = dense.all_pairs_distances(graph, **kwargs)
+        for index in range(len(graph.vertices)):
+            metrics, _ = shortest_paths(adjacency, index)
+            self.assertEqual(list(distances[index]), list(metrics))
+
+    def test_blocks_and_chunks(self):
+        for seed in range(4):
+            graph = generators.random_graph(37, 90, seed=seed,
+                                            is_oriented=seed % 2 == 1)
+            # blocks and chunks not dividing the size, down to single lines
+            for block_size, chunk_cells in ((1, 1), (5, 37), (8, 100),
+                                             (64, 1 << 15)):
+                self.assert_matches_dijkstra(graph, block_size=block_size,
+                                             chunk_cells=chunk_cells)
+
+    def test_unreachable(self):
+        graph = generators.random_graph(20, 8, seed=5, is_oriented=True)
+        self.assert_matches_dijkstra(graph, block_size=3, chunk_cells=7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import dfs
+import generators
+import repr_types
+from data_structures import Graph
+
+
+def recursive_dfs(graph):
+    # the recursive search dfs_search replaced, as a reference
+    table = {vertice: dfs.Board() for vertice in graph.vertices}
+    adjacent_list = repr_types.adjacent_list(graph)
+
+    def visit(vertice, time):
+        board = table[vertice]
+        board.visited = True
+        time += 1
+        board.visit_timestamp = time
+        for neighbour in adjacent_list[graph.index_of(vertice)]:
+            if not table[neighbour].visited:
+                board.entry = neighbour
+                time = visit(neighbour, time)
+        time += 1
+        board.completed_timestamp = time
+        return time
+
+    time = 0
+    for vertice in graph.vertices:
+        if not table[vertice].visited:
+            time = visit(vertice, time)
+    return list(table.values()), time
+
+
+class DfsTest(unittest.TestCase):
+    def test_matches_recursive_search(self):
+        for seed in range(8):
+            graph = generators.random_graph(25, 30, seed=seed,
+                                            is_oriented=seed % 2 == 1,
+                                            is_weighted=False)
+            graph.add_edge('3', '3')
+            table, timestamp = dfs.dfs_search(graph)
+            self.assertEqual((list(table), timestamp), recursive_dfs(graph))
+
+    def test_long_path(self):
+        size = 6000
+        graph = Graph(name='path', is_oriented=True, is_weighted=False)
+        graph.vertices.extend(str(index) for index in range(size))
+        for index in range(size - 1):
+            graph.edges.add(str(index), str(index + 1))
+
+        table, timestamp = dfs.dfs_search(graph)
+        table = list(table)
+        self.assertEqual(timestamp, 2 * size)
+        for index, board in enumerate(table):
+            self.assertEqual(board.visit_timestamp, index + 1)
+            self.assertEqual(board.completed_timestamp, 2 * size - index)
+            self.assertEqual(board.entry,
+                             str(index + 1) if index + 1 < size else None)
+
+    def test_events_order(self):
+        graph = Graph(name='tree', is_oriented=True, is_weighted=False)
+        graph.vertices.extend('abcd')
+        for source, target in (('a', 'b'), ('b', 'c'), ('a', 'd')):
+            graph.edges.add(source, target)
+        self.assertEqual(list(dfs.dfs_events(graph)), [
+            (dfs.VISIT, 'a', None, 1),
+            (dfs.VISIT, 'b', 'a', 2),
+            (dfs.VISIT, 'c', 'b', 3),
+            (dfs.COMPLETE, 'c', 'b', 4),
+            (dfs.COMPLETE, 'b', 'a', 5),
+            (dfs.VISIT, 'd', 'a', 6),
+            (dfs.COMPLETE, 'd', 'a', 7),
+            (dfs.COMPLETE, 'a', None, 8),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import math
+import unittest
+
+import dijkstra
+import generators
+
+
+class SearchTest(unittest.TestCase):
+    def test_target_early_exit(self):
+        graph = generators.random_graph(60, 150, seed=6)
+        full = {item.vertice: item for item in dijkstra.search(graph, '0')}
+        for target in ('7', '31', '0'):
+            items = list(dijkstra.search(graph, '0', target=target))
+            self.assertEqual(items[graph.index_of(target)], full[target])
+            for item in items:
+                # every entry left is final, the others are unreached
+                if item.metric != math.inf:
+                    self.assertEqual(item, full[item.vertice])
+                    self.assertLessEqual(item.metric, full[target].metric)
+                else:
+                    self.assertIsNone(item.path)
+
+        # the source is settled first, nothing else is final
+        items = dijkstra.search(graph, '0', target='0')
+        self.assertEqual([item.vertice for item in items
+                          if item.metric != math.inf], ['0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import random
+import unittest
+
+import generators
+import kruskal
+from dynamic_mst import DynamicSpanningTree, spanning_tree
+
+
+class DynamicSpanningTreeTest(unittest.TestCase):
+    def test_matches_kruskal(self):
+        rand = random.Random(3)
+        for algorithm in ('kruskal', 'prim'):
+            graph = generators.random_graph(40, 50, seed=7)
+            tree = spanning_tree(graph, algorithm)
+            for step in range(150):
+                source, target = str(rand.randrange(45)), str(rand.randrange(45))
+                value = rand.randint(1, 100)
+                if step % 2:
+                    tree.add_edge(source, target, value)
+                else:   # appended behind the tree back
+                    graph.add_edge(source, target, value)
+                    tree = spanning_tree(graph, algorithm)
+                if step % 40 == 0:
+                    graph.edges.set_value(0, 1)
+                    tree = spanning_tree(graph, algorithm)
+                expected = list(kruskal.min_spanning_tree(graph))
+                self.assertEqual(tree.weight,
+                                 sum(edge.value for edge in expected))
+                self.assertEqual(len(tree), len(expected))
+
+    def test_rejects_oriented(self):
+        graph = generators.random_graph(10, 20, is_oriented=True)
+        with self.assertRaises(ValueError):
+            DynamicSpanningTree(graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import random
+import unittest
+
+import dijkstra
+import generators
+from data_structures import Graph
+from dynamic_paths import ShortestPathTree, shortest_path_tree
+
+
+class ShortestPathTreeTest(unittest.TestCase):
+    def assert_matches_search(self, tree):
+        graph = tree.graph
+        expected = dijkstra.search(graph, tree.source)
+        metrics = {item.vertice: item.metric for item in expected}
+        self.assertEqual({item.vertice: item.metric for item in tree.items()},
+                         metrics)
+        # parents may differ between equal paths, their lengths may not
+        for item in tree.items():
+            path = tree.path(item.vertice)
+            if path:
+                self.assertEqual(path[0], tree.source)
+                self.assertEqual(path[-1], item.vertice)
+
+    def test_weight_changes(self):
+        for seed in range(6):
+            rand = random.Random(seed)
+            graph = generators.random_graph(40, 80, seed=seed,
+                                            is_oriented=seed % 2 == 1,
+                                            max_weight=20)
+            tree = ShortestPathTree(graph, graph.vertices[0])
+            for _ in range(60):
+                index = rand.randrange(len(graph.edges))
+                tree_edge = index in tree.parents
+                previous = graph.edges.value(index)
+                # raise tree edges more often, they are the ones to repair
+                if tree_edge or rand.random() < 0.3:
+                    value = previous + rand.randint(1, 30)
+                else:
+                    value = rand.randint(0, 20)
+                tree.set_weight(index, value)
+                self.assert_matches_search(tree)
+
+    def test_appended_edges(self):
+        rand = random.Random(9)
+        graph = generators.random_graph(30, 40, seed=3, is_oriented=True)
+        for step in range(80):
+            source, target = str(rand.randrange(35)), str(rand.randrange(35))
+            if step % 2:
+                shortest_path_tree(graph, '0').add_edge(source, target,
+                                                        rand.randint(0, 50))
+            else:   # appended behind the tree back
+                graph.add_edge(source, target, rand.randint(0, 50))
+            if step % 25 == 0:
+                graph.vertices.insert(0, f'first-{step}')
+            self.assert_matches_search(shortest_path_tree(graph, '0'))
+
+    def test_raise_disconnects(self):
+        graph = Graph(name='path', is_oriented=True, is_weighted=True)
+        graph.vertices.extend('abcdef')
+        for source, target in zip('abcde', 'bcdef'):
+            graph.edges.add(source, target, 1)
+        tree = ShortestPathTree(graph, 'a')
+        tree.add_edge('a', 'f', 100)
+        tree.set_weight(2, 1000)
+        self.assert_matches_search(tree)
+        self.assertEqual(tree.path('f'), ['a', 'f'])
+        self.assertEqual(tree.path('d'), ['a', 'b', 'c', 'd'])
+
+
+if __name__ == '__main__':
+    unittest.main()
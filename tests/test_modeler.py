@@ -0,0 +1,137 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import generators
+import modeler
+
+
+class JsonStreamTest(unittest.TestCase):
+    def setUp(self):
+        graph = generators.random_graph(30, 60, seed=2)
+        graph.vertices.append('ünïcode "quoted" \\ label')
+        graph.edges.add('0', 'ünïcode "quoted" \\ label', 12345678901.5)
+        self.document = modeler.graph_dict(graph)
+        self.document['extra'] = {'nested': [1, [2, 3], {'a': None}]}
+        self.text = json.dumps(self.document, indent=4, ensure_ascii=False)
+
+    def read_fields(self, data, chunk_size):
+        fields = {}
+        for key, value in modeler._read_graph_fields(io.BytesIO(data),
+                                                     chunk_size=chunk_size):
+            if key in ('vertices', 'edges'):
+                value = list(value)
+            fields[key] = value
+        return fields
+
+    def test_small_chunks(self):
+        data = self.text.encode('utf-8')
+        # chunks split numbers, strings and multi-byte characters
+        for chunk_size in range(1, 12):
+            self.assertEqual(self.read_fields(data, chunk_size), self.document)
+
+    def test_compact_document(self):
+        data = json.dumps(self.document, separators=(',', ':')).encode('utf-8')
+        for chunk_size in (1, 2, 3, 64):
+            self.assertEqual(self.read_fields(data, chunk_size), self.document)
+
+    def test_empty_collections(self):
+        for text in ('{}', '{"vertices": [], "edges": []}', ' { "name" : "x" } '):
+            document = json.loads(text)
+            self.assertEqual(self.read_fields(text.encode('utf-8'), 1),
+                             document)
+
+    def test_malformed(self):
+        for text in ('{"vertices": [1, 2', '{"edges": [1 2]}', '['):
+            with self.assertRaises(ValueError):
+                self.read_fields(text.encode('utf-8'), 3)
+
+    def test_read_graph(self):
+        graph = modeler.read_graph(io.BytesIO(self.text.encode('utf-8')))
+        self.assertEqual(modeler.graph_dict(graph)['edges'],
+                         self.document['edges'])
+
+    def test_extra_keys_ignored(self):
+        self.document.update(version=3, clone=2, edges_size=61)
+        data = json.dumps(self.document).encode('utf-8')
+        compact_graph, _ = modeler.read_compact_graph(io.BytesIO(data))
+        for graph in (modeler.read_graph(io.BytesIO(data)), compact_graph):
+            self.assertEqual(graph.name, self.document['name'])
+            self.assertTrue(callable(graph.clone))
+            self.assertIsInstance(graph.version, tuple)
+
+
+class ImportEdgesTest(unittest.TestCase):
+    def create_graph(self, text, **kwargs):
+        return modeler.create_graph_from_edges(io.StringIO(text), **kwargs)
+
+    def test_header_implies_weighted(self):
+        graph = self.create_graph('Source, Target, Weight\na,b,3\nb,c,2.5\n')
+        self.assertTrue(graph.is_weighted)
+        self.assertEqual(graph.edges.rows(), [('a', 'b', 3), ('b', 'c', 2.5)])
+
+        graph = self.create_graph('source,target\na,b\n')
+        self.assertFalse(graph.is_weighted)
+        self.assertEqual(graph.edges.rows(), [('a', 'b', None)])
+
+    def test_first_row_without_header(self):
+        graph = self.create_graph('a,b\n# comment\n\nb,c\n')
+        self.assertEqual(list(graph.vertices), ['a', 'b', 'c'])
+        self.assertEqual(len(graph.edges), 2)
+
+    def test_unordered_pairs_deduplicated(self):
+        text = 'a,b,1\nb,a,2\na,b,3\nb,c,4\n'
+        graph = self.create_graph(text, is_weighted=True)
+        self.assertEqual(graph.edges.rows(), [('a', 'b', 1), ('b', 'c', 4)])
+
+        graph = self.create_graph(text, is_weighted=True, is_oriented=True)
+        self.assertEqual(len(graph.edges), 4)
+
+    def test_line_numbered_errors(self):
+        cases = (('source,target,weight\na,b,1\nb,c\n', False, 'Line 3:'),
+                 ('a,b,1\nb,c,heavy\n', True, 'Line 2:'),
+                 ('a,b\nc\n', False, 'Line 2:'))
+        for text, is_weighted, message in cases:
+            with self.assertRaises(ValueError) as raised:
+                self.create_graph(text, is_weighted=is_weighted)
+            self.assertTrue(str(raised.exception).startswith(message),
+                            raised.exception)
+
+    def test_delimiter_by_extension(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for extension, text in (('.tsv', 'a\tb\t1\nb\tc\t2\n'),
+                                    ('.csv', 'a,b,1\nb,c,2\n')):
+                filename = os.path.join(directory, f'edges{extension}')
+                with open(filename, 'w') as writer:
+                    writer.write(text)
+                args = modeler.argument_parser().parse_args(
+                    ['-i', filename, '--weighted', '--name', 'edges',
+                     '-d', directory])
+                with args.import_edges:
+                    graph = modeler.load_graph(args)
+                self.assertEqual(graph.edges.rows(),
+                                 [('a', 'b', 1), ('b', 'c', 2)])
+
+
+class InteractionTest(unittest.TestCase):
+    def create_graph(self, answers):
+        answers = iter(answers)
+        with mock.patch('builtins.input', lambda prompt='': next(answers)), \
+                contextlib.redirect_stdout(io.StringIO()):
+            return modeler.create_graph_from_interaction()
+
+    def test_rejected_attempt_is_dropped(self):
+        graph = self.create_graph(['g', '', '', 'y',
+                                   'a', 'b', '', '', 'n',
+                                   'c', 'd', '', '', 'y'])
+        self.assertEqual(list(graph.vertices), ['c', 'd'])
+        self.assertEqual([tuple(edge.pair) for edge in graph.edges],
+                         [('c', 'd')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import math
+import random
+import unittest
+
+import dijkstra
+import generators
+import point_to_point
+
+
+class PointToPointTest(unittest.TestCase):
+    def assert_shortest_path(self, graph, items, source, target, expected):
+        metric = expected[target].metric
+        if metric == math.inf:
+            self.assertEqual(items, [])
+            return
+        self.assertEqual(items[0].vertice, source)
+        self.assertEqual(items[-1].vertice, target)
+        self.assertEqual(items[-1].metric, metric)
+        for previous, item in zip(items, items[1:]):
+            self.assertEqual(item.path, previous.vertice)
+            # every prefix of a shortest path is one too
+            self.assertEqual(item.metric, expected[item.vertice].metric)
+
+    def searches(self, graph, target):
+        landmarks = point_to_point.landmarks(graph, count=4)
+        heuristic = landmarks.heuristic(graph.index_of(target))
+        return (
+            point_to_point.bidirectional_search,
+            point_to_point.astar_search,
+            lambda graph, source, target: point_to_point.astar_search(
+                graph, source, target, heuristic=heuristic),
+        )
+
+    def test_matches_dijkstra(self):
+        rand = random.Random(8)
+        for seed in range(60):
+            # sparse graphs, so some targets are unreachable
+            size = rand.randint(2, 40)
+            graph = generators.random_graph(size, rand.randint(1, 2 * size),
+                                            seed=seed,
+                                            is_oriented=seed % 2 == 1,
+                                            is_weighted=seed % 3 != 0)
+            source = rand.choice(graph.vertices)
+            expected = {item.vertice: item
+                        for item in dijkstra.search(graph, source)}
+            for target in rand.sample(list(graph.vertices), min(size, 5)) \
+                    + [source]:
+                for search in self.searches(graph, target):
+                    items = search(graph, source, target)
+                    self.assert_shortest_path(graph, items, source, target,
+                                              expected)
+
+    def test_source_is_target(self):
+        graph = generators.random_graph(10, 15, seed=2)
+        for search in self.searches(graph, '3'):
+            items = search(graph, '3', '3')
+            self.assertEqual([(item.vertice, item.path, item.metric)
+                              for item in items], [('3', None, 0)])
+
+    def test_unreachable(self):
+        graph = generators.random_graph(6, 0)
+        graph.add_edge('0', '1', 4)
+        for search in self.searches(graph, '5'):
+            self.assertEqual(search(graph, '0', '5'), [])
+
+    def test_euclidean_heuristic(self):
+        graph = generators.grid_graph(8, 9, seed=3)
+        coordinates = generators.grid_coordinates(8, 9)
+        expected = {item.vertice: item for item in dijkstra.search(graph, '0')}
+        for target in ('71', '40', '8'):
+            heuristic = point_to_point.euclidean_heuristic(graph, coordinates,
+                                                           target)
+            items = point_to_point.astar_search(graph, '0', target,
+                                                heuristic=heuristic)
+            self.assert_shortest_path(graph, items, '0', target, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
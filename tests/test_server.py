@@ -0,0 +1,82 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+import batch
+import generators
+import modeler
+from server import GraphServer
+
+
+class GraphServerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.server = GraphServer()
+        self.addCleanup(self.server.executor.shutdown)
+
+    def load(self, graph):
+        graph.name = 'graph'
+        modeler.dumps(graph, directory=self.directory.name)
+        filename = os.path.join(self.directory.name, 'graph.json')
+        return self.server.answer({'query': 'load', 'file': filename})
+
+    def test_cached_until_changed(self):
+        self.load(generators.random_graph(20, 40, seed=1))
+        request = {'query': 'kruskal', 'graph': 'graph'}
+        first = self.server.answer(request)
+        self.assertIs(self.server.answer(request), first)
+        self.assertEqual(self.server.cache.hits, 1)
+
+        self.server.answer({'query': 'add_edge', 'graph': 'graph',
+                            'source': '0', 'target': 'new', 'value': 1})
+        self.assertIsNot(self.server.answer(request), first)
+
+    def test_reload_replaces_results(self):
+        request = {'query': 'kruskal', 'graph': 'graph'}
+        answers = []
+        # same name and version, only the load tells them apart
+        for seed in (1, 2):
+            self.load(generators.random_graph(20, 40, seed=seed))
+            answers.append(self.server.answer(request))
+        self.assertNotEqual(answers[0], answers[1])
+        self.assertEqual(self.server.cache.hits, 0)
+
+    def test_slow_query_leaves_loop_free(self):
+        self.load(generators.random_graph(20, 40, seed=1))
+        _, graph = self.server.graph('graph')
+        expected = batch.solve(graph.clone(), 'kruskal')
+        started, release = threading.Event(), threading.Event()
+        solve = self.server.solve
+
+        def slow_solve(graph, request):
+            started.set()
+            release.wait(5)
+            return solve(graph, request)
+        self.server.solve = slow_solve
+
+        async def scenario():
+            query = asyncio.ensure_future(self.server.respond(
+                {'query': 'kruskal', 'graph': 'graph'}))
+            change = asyncio.ensure_future(self.server.respond(
+                {'query': 'add_edge', 'graph': 'graph', 'source': '0',
+                 'target': 'new', 'value': 1}))
+            await asyncio.get_running_loop().run_in_executor(None,
+                                                             started.wait, 5)
+            # answered while the query runs, the change waits for it
+            graphs = await self.server.respond({'query': 'graphs'})
+            self.assertEqual(graphs[0]['edges'], 40)
+            self.assertFalse(change.done())
+            release.set()
+            return await query, await change
+
+        result, change = asyncio.run(scenario())
+        # the query saw the graph as it was before the change
+        self.assertEqual(result, expected)
+        self.assertEqual(change, {'edges': 41})
+
+
+if __name__ == '__main__':
+    unittest.main()
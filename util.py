@@ -4,6 +4,9 @@
 """
 
 
+import textwrap
+
+
 class RateLimitExceeded(Exception): pass
 
 
@@ -83,7 +86,16 @@ def format_sized(string_fmt, size):
     return '{' + string_fmt + str(size) + '}'
 
 
-def display_table(section, keys, table, lines=None, end="\n"):
+def display_table(section, keys, table, lines=None, end="\n", summary=None):
+    """
+    Prints the table rows, which may be any iterable of cell lists, under
+    the keys. Lines label each row and the summary is shown below the rows.
+    Keys are widened to fit the cells of list tables, other iterables are
+    printed as they come.
+    """
+    if isinstance(table, list):
+        keys = _fit_keys(keys, table)
+
     header_sep = ' | '
     header_sep_size = len(header_sep)
 
@@ -99,7 +111,7 @@ def display_table(section, keys, table, lines=None, end="\n"):
         # take a copy for changing
         keys, lines = keys.copy(), lines.copy()
 
-        largest_line = len(max(lines)) + 2
+        largest_line = max((len(str(line)) for line in lines), default=0) + 2
 
         line_separator = '|'
         empty_header = f"{' ' * (largest_line)}" + line_separator
@@ -115,6 +127,23 @@ def display_table(section, keys, table, lines=None, end="\n"):
         fmt = format_sized(string_fmt, header_size)
         display(fmt.format(text))
 
+    # cell formatters by row size, built once per table
+    formatters = {}
+
+    def row_formatters(size):
+        cell_formatters = formatters.get(size)
+        if cell_formatters is None:
+            cell_formatters = []
+            for key_index in range(size):
+                key_size = len(keys[key_index])
+                if key_index != size - 1: # decrements one time
+                    key_size += header_sep_size
+                else:
+                    key_size += 2
+                cell_formatters.append(format_sized(':^', key_size).format)
+            formatters[size] = cell_formatters
+        return cell_formatters
+
     fill_line()
     display_padded(':^', section)
 
@@ -124,24 +153,26 @@ def display_table(section, keys, table, lines=None, end="\n"):
 
 
     for table_index, items in enumerate(table):
-        line = ''
-        last_index = len(items) - 1
-
-        for key_index, value in enumerate(items):
-            key_size = len(keys[key_index])
-
-            if key_index != last_index: # decrements one time
-                 key_size += header_sep_size
-            else:
-                key_size += 2
+        line = ''.join([formatter(value) for formatter, value
+                        in zip(row_formatters(len(items)), items)])
 
-            formatted_line = format_sized(':^', key_size).format(value)
-
-            if key_index == 0 and lines is not None:
-                new_line = line_fmt.format(lines[table_index])
-                formatted_line = ' ' + new_line + line_separator + formatted_line
-
-            line += formatted_line
+        if items and lines is not None:
+            new_line = line_fmt.format(lines[table_index])
+            line = ' ' + new_line + line_separator + line
         display(line)
+
+    if summary is not None:
+        fill_line(separator='-')
+        for summary_line in textwrap.wrap(summary, max(header_size, 1)):
+            display_padded(':^', summary_line)
     fill_line()
     print(end=end)
+
+
+def _fit_keys(keys, table):
+    # cells wider than their key would break the table borders
+    widths = [len(key) for key in keys]
+    for items in table:
+        for index, value in enumerate(items[:len(widths)]):
+            widths[index] = max(widths[index], len(str(value)))
+    return [key.center(width) for key, width in zip(keys, widths)]